@@ -6,29 +6,97 @@ from src.models import DatabaseConfig
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import so SQLAlchemy's compiled-statement cache keeps a
+# single entry for the lookup instead of re-compiling a fresh text() per call
+_VILLAGE_Q = text("SELECT village FROM household WHERE _id = :hh_id")
+
+# Cache of hh_id -> village for the duration of a migration run. Village is
+# a property of the household, not the person, so persons sharing a household
+# resolve with a single query per household instead of one per person.
+_village_cache: Dict[int, Optional[str]] = {}
+
+# One long-lived connection per engine; opening and closing a connection
+# around every lookup would dominate the cost of the query itself.
+_village_conns: Dict = {}
+
+def _connection_for(engine):
+    conn = _village_conns.get(engine)
+    if conn is None:
+        conn = engine.connect()
+        _village_conns[engine] = conn
+    return conn
+
 # Project-specific transformation functions
 def get_village_from_household(engine, record):
-    """Get village value from household table using a join.
-    
+    """Get village value from household table, cached per household id.
+
     This is a project-specific transformation function that demonstrates
-    how to perform complex transformations using SQL joins.
+    how to perform complex transformations using SQL lookups.
+    """
+    hh_id = record.hh_id
+    if hh_id in _village_cache:
+        return _village_cache[hh_id]
+    village = _connection_for(engine).execute(_VILLAGE_Q, {"hh_id": hh_id}).scalar()
+    _village_cache[hh_id] = village
+    return village
+
+def get_village_from_household_batch(conn, records):
+    """Batch variant of get_village_from_household.
+
+    Looks up villages for a whole batch of person records with a single
+    IN-clause query instead of one query per record, avoiding the N+1
+    round-trip pattern during migration.
+    """
+    ids = [record["_id"] for record in records]
+    placeholders = ", ".join("?" for _ in ids)
+    query = f"""
+        SELECT person._id, hh.village
+        FROM hh_person person
+        LEFT JOIN household hh ON person.hh_id = hh._id
+        WHERE person._id IN ({placeholders})
+    """
+    villages = dict(conn.execute(query, ids).fetchall())
+    return [villages.get(record["_id"]) for record in records]
+
+# Mark as batch-mode so the migrator calls it once per insert batch
+get_village_from_household_batch._batch = True
+
+def _title_or_none(value):
+    """Capitalize the first letter of each word, passing None/empty through."""
+    return value.title() if value else None
+
+def make_village_lookup(engine):
+    """Build a village transformation that preloads household once.
+
+    Household tables are small relative to persons, so a single SELECT
+    into a dict replaces one query per migrated person; each lookup is
+    then a plain dict hit.
     """
-    query = text("""
-        SELECT hh.village 
-        FROM hh_person person 
-        LEFT JOIN household hh ON person.hh_id = hh._id 
-        WHERE person._id = :person_id
-    """)
     with engine.connect() as conn:
-        result = conn.execute(query, {"person_id": record._id}).first()
-        return result[0] if result else None
+        villages = dict(conn.execute(text("SELECT _id, village FROM household")).all())
+    return lambda record: villages.get(record.hh_id)
 
-# Project-specific schema configuration
+# Project-specific schema configuration.
+#
+# The village lookup is folded directly into the hh_person source query via
+# source_query_overrides, so the migrator reads it as a regular column and no
+# per-row callback runs. The get_village_from_household* functions above are
+# kept as fallback samples for cases where a SQL override is not possible.
+# Note that a column transformation only runs when the source rows include
+# the column: wiring one of these for "village" without the override does
+# nothing (village is target-only on hh_person) - the migrator warns when a
+# configured transformation is unusable for that reason.
 SCHEMA_CONFIG = DatabaseConfig(
     source_db_path="data/source.db",
     target_db_path="data/target.db",
     column_transformations={
-        "name": lambda x: x.title() if x else None,  # Capitalize names
-        "village": get_village_from_household,  # Complex transformation using SQL join
+        "name": _title_or_none,  # Capitalize names
+    },
+    source_query_overrides={
+        "hh_person": """
+            SELECT person.*, hh.village AS village
+            FROM hh_person person
+            LEFT JOIN household hh ON person.hh_id = hh._id
+        """,
     }
 )
\ No newline at end of file
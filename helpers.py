@@ -1,16 +1,51 @@
 #!/usr/bin/env python3
 import sys
 import os
+import atexit
+import functools
+import shlex
 import subprocess
 import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import PurePosixPath
 from typing import List, Dict, Set, Tuple
-import argparse
+
+def _clear_screen():
+    """Clear the terminal with an ANSI escape instead of spawning a shell.
+
+    os.system('cls'/'clear') forks a child process just to emit a few
+    bytes; writing the escape sequence directly avoids that. On Windows,
+    an empty os.system call first enables VT processing in the console.
+    """
+    if os.name == 'nt':
+        os.system('')
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
 def ensure_data_directory():
     """Ensure the data directory exists."""
     if not os.path.exists('data'):
         os.makedirs('data')
 
+def _run_transfer(cmd: List[str]) -> None:
+    """Run a long adb transfer without blocking the calling thread.
+
+    subprocess.run holds the thread for the whole transfer; Popen plus a
+    short poll loop yields the GIL between checks so other threads
+    (parallel pushes, progress reporting) keep running. Output stays on
+    the terminal, so adb's own progress lines show as before.
+
+    Raises:
+        subprocess.CalledProcessError: On a non-zero exit code, matching
+            subprocess.run(..., check=True)
+    """
+    process = subprocess.Popen(cmd)
+    while process.poll() is None:
+        time.sleep(0.05)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+
 def pull_database(target_file=None):
     """Pull the ODK-X database from the connected Android device.
     
@@ -35,7 +70,7 @@ def pull_database(target_file=None):
     
     try:
         # Pull the database file from device
-        subprocess.run(['adb', 'pull', device_path, target_path], check=True)
+        _run_transfer(['adb', 'pull', device_path, target_path])
         print(f"Successfully pulled database to {target_path}")
     except subprocess.CalledProcessError as e:
         print(f"Error pulling database: {e}")
@@ -66,7 +101,7 @@ def push_database():
         
         # Push the database file to device
         print("Pushing database to device...")
-        subprocess.run(['adb', 'push', source_path, device_path], check=True)
+        _run_transfer(['adb', 'push', source_path, device_path])
         print(f"Successfully pushed database to device at {device_path}")
     except subprocess.CalledProcessError as e:
         print(f"Error pushing database: {e}")
@@ -86,61 +121,78 @@ def clean_device_db():
         int: Number of files removed
     """
     device_dir = '/sdcard/opendatakit/default/data/webDb/'
-    main_db_file = os.path.join(device_dir, 'sqlite.db')
+    # Device paths are always POSIX; os.path.join would produce
+    # backslashes on Windows that adb can't use
+    main_db_file = str(PurePosixPath(device_dir) / 'sqlite.db')
     
     try:
-        # First, close all ODK-X apps
+        # First, close all ODK-X apps with a single adb round-trip
         print("Closing ODK-X apps...")
         try:
-            subprocess.run(['adb', 'shell', 'am', 'force-stop', 'org.opendatakit.survey'], check=True)
-            subprocess.run(['adb', 'shell', 'am', 'force-stop', 'org.opendatakit.tables'], check=True)
-            subprocess.run(['adb', 'shell', 'am', 'force-stop', 'org.opendatakit.services'], check=True)
+            subprocess.run(
+                ['adb', 'shell',
+                 'am force-stop org.opendatakit.survey; '
+                 'am force-stop org.opendatakit.tables; '
+                 'am force-stop org.opendatakit.services'],
+                check=True
+            )
             print("All ODK-X apps closed successfully")
         except subprocess.CalledProcessError as e:
             print(f"Warning: Error closing one or more ODK-X apps: {e}")
             print("Continuing with database cleanup...")
         
-        # List all files in the directory
+        # Let the device shell filter for us: find emits exactly the paths we
+        # want, one per line, instead of ls -la metadata that needs fragile
+        # Python-side tokenization (and breaks on filenames with spaces).
         result = subprocess.run(
-            ['adb', 'shell', 'ls', '-la', device_dir], 
-            check=True, 
-            capture_output=True, 
+            ['adb', 'shell',
+             f"find {device_dir} -maxdepth 1 -type f "
+             r"\( -name 'sqlite.db' -o -name '*.db-*' -o -name '*.db.was' \)"],
+            check=False,
+            capture_output=True,
             text=True
         )
-        
-        # Find all database and temporary SQLite files
-        files_to_remove = []
-        for line in result.stdout.splitlines():
-            # Skip directory entries and non-file lines
-            if line.startswith('d') or not line.strip():
-                continue
-                
-            # Extract filename
-            parts = line.split()
-            if len(parts) >= 8:  # Standard ls -la format has at least 8 parts
-                filename = parts[-1]
-                file_path = os.path.join(device_dir, filename)
-                
-                # Add main database file
-                if filename == 'sqlite.db':
-                    files_to_remove.append(file_path)
-                # Check for SQLite temp file patterns
-                elif (filename.endswith('.db-journal') or 
-                    filename.endswith('.db-wal') or 
-                    filename.endswith('.db-shm') or 
-                    filename.endswith('.db.was') or
-                    '.db-' in filename):
-                    files_to_remove.append(file_path)
-        
-        # Remove each file
+
+        if result.returncode == 0:
+            files_to_remove = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+        else:
+            # Some devices ship without find; fall back to a plain listing
+            # and match the patterns in Python.
+            result = subprocess.run(
+                ['adb', 'shell', 'ls', '-1', device_dir],
+                check=True,
+                capture_output=True,
+                text=True
+            )
+            files_to_remove = []
+            for line in result.stdout.splitlines():
+                filename = line.strip()
+                if not filename:
+                    continue
+                if (filename == 'sqlite.db' or
+                        filename.endswith('.db.was') or
+                        '.db-' in filename):
+                    files_to_remove.append(str(PurePosixPath(device_dir) / filename))
+        
+        # Remove all files with a single adb invocation; each adb round-trip
+        # costs far more than the rm itself, so one batched call replaces
+        # one subprocess per file.
         removed_count = 0
-        for file_path in files_to_remove:
-            try:
+        if files_to_remove:
+            for file_path in files_to_remove:
                 print(f"Removing file: {file_path}")
-                subprocess.run(['adb', 'shell', 'rm', file_path], check=True)
-                removed_count += 1
-            except subprocess.CalledProcessError as e:
-                print(f"Error removing file {file_path}: {e}")
+            try:
+                quoted = [shlex.quote(path) for path in files_to_remove]
+                subprocess.run(['adb', 'shell', f"rm -f {' '.join(quoted)}"], check=True)
+                removed_count = len(files_to_remove)
+            except subprocess.CalledProcessError:
+                # Fall back to per-file removal to identify the offender
+                for file_path in files_to_remove:
+                    try:
+                        subprocess.run(['adb', 'shell', 'rm', '-f', file_path], check=True)
+                        removed_count += 1
+                    except subprocess.CalledProcessError as e:
+                        print(f"Error removing file {file_path}: {e}")
         
         if removed_count > 0:
             print(f"Successfully removed {removed_count} database files")
@@ -153,12 +205,17 @@ def clean_device_db():
         print(f"Error accessing device directory: {e}")
         sys.exit(1)
 
-def push_attachments():
+def push_attachments(force: bool = False):
     """Push the attachment folders to the connected Android device.
-    
+
     Copies all folders and files under data/attachments to the device at
     /sdcard/opendatakit/default/data/tables/[table_name]/instances/
-    
+
+    Args:
+        force: If True, push everything unconditionally. By default adb's
+               --sync mode skips files whose size and mtime already match
+               on the device, so re-runs only transfer the delta.
+
     Raises:
         FileNotFoundError: If the attachments directory doesn't exist
         subprocess.CalledProcessError: If there's an error pushing the files
@@ -184,60 +241,59 @@ def push_attachments():
     successful_tables = 0
     successful_instances = 0
     failed_tables = []
-    
-    for table in tables:
+
+    def _push_table(table: str):
+        """Push one table's instances with a single recursive adb push.
+
+        Returns (table, instance_count), where instance_count is None when
+        the table has no 'instances' directory.
+        """
         source_table_dir = os.path.join(source_dir, table)
-        device_table_dir = f"{device_base_dir}/{table}"
-        
-        print(f"\nProcessing table: {table}")
-        
-        try:
-            # Create the table directory on the device if it doesn't exist
-            subprocess.run(['adb', 'shell', 'mkdir', '-p', device_table_dir], check=True)
-            
-            # Get all instance directories in the source table directory
-            instance_dirs = os.listdir(source_table_dir)
-            if 'instances' in instance_dirs:
-                # If there's an 'instances' directory, push it directly to the table directory
-                source_instances_dir = os.path.join(source_table_dir, 'instances')
-                device_instances_dir = f"{device_table_dir}/instances"
-                
-                # Create the instances directory on the device
-                subprocess.run(['adb', 'shell', 'mkdir', '-p', device_instances_dir], check=True)
-                
-                table_instances = 0
-                
-                # Push all instance subdirectories
-                for instance_dir in os.listdir(source_instances_dir):
-                    source_instance_path = os.path.join(source_instances_dir, instance_dir)
-                    device_instance_path = f"{device_instances_dir}/{instance_dir}"
-                    
-                    if os.path.isdir(source_instance_path):
-                        try:
-                            # Create the instance directory on the device
-                            subprocess.run(['adb', 'shell', 'mkdir', '-p', device_instance_path], check=True)
-                            
-                            # Count files to be pushed
-                            files = [f for f in os.listdir(source_instance_path) if os.path.isfile(os.path.join(source_instance_path, f))]
-                            if files:
-                                # Push all files in the instance directory
-                                print(f"  Pushing {len(files)} files for instance {instance_dir}")
-                                subprocess.run(['adb', 'push', f"{source_instance_path}/.", device_instance_path], check=True)
-                                table_instances += 1
-                                successful_instances += 1
-                            else:
-                                print(f"  No files found in instance {instance_dir}")
-                        except subprocess.CalledProcessError as e:
-                            print(f"  Error pushing instance {instance_dir}: {e}")
-                
-                print(f"Successfully pushed {table_instances} instances for table {table}")
-                successful_tables += 1
-            else:
-                print(f"No 'instances' directory found in {source_table_dir}")
-        except subprocess.CalledProcessError as e:
-            print(f"Error processing table {table}: {e}")
-            failed_tables.append(table)
-            continue
+        device_table_dir = str(PurePosixPath(device_base_dir) / table)
+
+        # Create the table directory on the device if it doesn't exist
+        subprocess.run(['adb', 'shell', 'mkdir', '-p', device_table_dir],
+                       check=True, capture_output=True)
+
+        source_instances_dir = os.path.join(source_table_dir, 'instances')
+        if not os.path.isdir(source_instances_dir):
+            return table, None
+
+        # Count instances up front so the summary stays informative
+        table_instances = sum(
+            1 for d in os.listdir(source_instances_dir)
+            if os.path.isdir(os.path.join(source_instances_dir, d))
+        )
+
+        # One recursive push per table: adb recurses directories natively
+        # and coalesces small files, so this replaces one mkdir + push
+        # subprocess pair per instance. --sync skips files already present
+        # with matching size/mtime unless the caller forces a full push.
+        push_cmd = ['adb', 'push']
+        if not force:
+            push_cmd.append('--sync')
+        push_cmd += [source_instances_dir, device_table_dir]
+        subprocess.run(push_cmd, check=True, capture_output=True)
+        return table, table_instances
+
+    # Each push is I/O-bound on the adb link, so a small thread pool
+    # overlaps independent table transfers; returns diminish above ~4
+    # workers as USB bandwidth saturates.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {executor.submit(_push_table, table): table for table in tables}
+        for future in as_completed(futures):
+            table = futures[future]
+            try:
+                _, table_instances = future.result()
+                if table_instances is None:
+                    print(f"No 'instances' directory found for table {table}")
+                else:
+                    print(f"Successfully pushed {table_instances} instances for table {table}")
+                    successful_instances += table_instances
+                    successful_tables += 1
+            except subprocess.CalledProcessError as e:
+                print(f"Error processing table {table}: {e}")
+                failed_tables.append(table)
     
     print("\n" + "="*50)
     print("Attachment Push Summary:")
@@ -249,12 +305,122 @@ def push_attachments():
     print("="*50)
     print("Finished pushing attachment folders to device")
 
+def _quote_ident(name: str) -> str:
+    """Quote a table or column name for use in dynamically-built SQL.
+
+    Identifier names can't be bound as ? parameters, but quoting them
+    consistently keeps the generated statement text stable (so SQLite's
+    statement cache can reuse the prepared plan) and safe for names that
+    need escaping.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+def _open_fast(db_path: str) -> sqlite3.Connection:
+    """Open a connection tuned for bulk mutation of a working-copy database.
+
+    data/target.db is a scratch copy that gets re-pushed to the device, so
+    crash durability matters less than throughput. These PRAGMAs drop the
+    per-commit fsyncs and keep journal and temp B-trees in memory, which
+    makes mass DELETE/UPDATE passes CPU-bound instead of fsync-bound.
+    Read-only helpers keep the default PRAGMAs. No locking_mode=EXCLUSIVE
+    here: this connection lives for the whole process, and an exclusive
+    lock taken on the first write would shut out every other connection
+    to target.db - including this module's own pooled readers - until
+    exit.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.executescript("""
+        PRAGMA journal_mode=MEMORY;
+        PRAGMA synchronous=OFF;
+        PRAGMA temp_store=MEMORY;
+    """)
+    return conn
+
+# Long-lived read connections keyed by database path. Reopening a database
+# per call pays the connect and schema-bootstrap cost each time and throws
+# away SQLite's per-connection page cache, so repeated interactive queries
+# re-read pages from disk. Connections are closed at interpreter exit.
+_CONN_CACHE: Dict[str, sqlite3.Connection] = {}
+
+def _get_db(path: str) -> sqlite3.Connection:
+    """Return a pooled connection for the given database path."""
+    conn = _CONN_CACHE.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA cache_size=-65536")  # keep a 64 MiB hot page cache
+        _CONN_CACHE[path] = conn
+        atexit.register(conn.close)
+    return conn
+
+# Shared connection to data/target.db, opened lazily on first use. One
+# connection per process amortizes the connect/schema bootstrap cost across
+# CLI flows that hit the database several times, and lets the _open_fast
+# PRAGMAs and SQLite's prepared-statement cache pay off across calls.
+_conn = None
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared connection to data/target.db, opening it lazily.
+
+    Raises:
+        FileNotFoundError: If the database file doesn't exist
+    """
+    global _conn
+    if _conn is None:
+        db_path = os.path.join('data', 'target.db')
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database file {db_path} does not exist")
+        _conn = _open_fast(db_path)
+        atexit.register(_conn.close)
+    return _conn
+
+@functools.lru_cache(maxsize=4)
+def _scan_form_tables(db_path: str, mtime: float) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Scan the schema once, returning (form_tables, forms_with_attachments).
+
+    The schema is static within a run, but several helpers re-derive it on
+    every call. Caching keyed by the database file's mtime means repeated
+    callers pay one PRAGMA scan per process, and the cache invalidates
+    automatically when an adb pull replaces the file. Queries run on the
+    shared connection; db_path and mtime serve purely as the cache key.
+    """
+    cursor = _get_conn().cursor()
+
+    # One query via the pragma_table_info table-valued function replaces
+    # a PRAGMA round-trip per table; SQLite does the whole join in C.
+    try:
+        cursor.execute("""
+            SELECT m.name, GROUP_CONCAT(p.name)
+            FROM sqlite_master m JOIN pragma_table_info(m.name) p
+            WHERE m.type = 'table'
+            GROUP BY m.name
+        """)
+        table_columns = [(name, set(cols.split(','))) for name, cols in cursor.fetchall()]
+    except sqlite3.OperationalError:
+        # pragma_table_info requires SQLite >= 3.16; fall back to the
+        # per-table PRAGMA loop on older builds.
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tables = cursor.fetchall()
+        table_columns = []
+        for (table_name,) in tables:
+            cursor.execute(f"PRAGMA table_info({_quote_ident(table_name)})")
+            table_columns.append((table_name, {col[1] for col in cursor.fetchall()}))
+
+    form_tables = []
+    form_tables_with_attachments = []
+    for table_name, columns in table_columns:
+        if '_form_id' in columns and '_row_etag' in columns:
+            form_tables.append(table_name)
+            if any(col.endswith('_uriFragment') for col in columns):
+                form_tables_with_attachments.append(table_name)
+
+    return tuple(sorted(form_tables)), tuple(sorted(form_tables_with_attachments))
+
 def get_form_tables() -> List[str]:
     """Get all tables from target.db that have both _form_id and _row_etag columns.
-    
+
     Returns:
         List[str]: A sorted list of table names that have the required columns.
-        
+
     Raises:
         FileNotFoundError: If the database file doesn't exist
         sqlite3.Error: If there's an error accessing the database
@@ -263,25 +429,8 @@ def get_form_tables() -> List[str]:
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database file {db_path} does not exist")
 
-    conn = sqlite3.connect(db_path)
-    try:
-        cursor = conn.cursor()
-        
-        # Get all tables first
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
-        
-        form_tables = []
-        for (table_name,) in tables:
-            # For each table, check if it has both required columns
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = {col[1] for col in cursor.fetchall()}
-            if '_form_id' in columns and '_row_etag' in columns:
-                form_tables.append(table_name)
-        
-        return sorted(form_tables)
-    finally:
-        conn.close()
+    form_tables, _ = _scan_form_tables(db_path, os.path.getmtime(db_path))
+    return list(form_tables)
 
 def remove_instance_rows(table_name=None):
     """Remove all rows from form tables in the local target database (data/target.db).
@@ -299,7 +448,7 @@ def remove_instance_rows(table_name=None):
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database file {db_path} does not exist")
 
-    conn = sqlite3.connect(db_path)
+    conn = _get_conn()
     try:
         cursor = conn.cursor()
         all_form_tables = get_form_tables()
@@ -313,30 +462,38 @@ def remove_instance_rows(table_name=None):
         else:
             tables_to_process = all_form_tables
         
-        # Start a transaction for atomicity
-        cursor.execute("BEGIN TRANSACTION")
-        
+        # Count per table with one UNION ALL query so the printed figures
+        # survive the batched delete below
+        counts = {}
+        if tables_to_process:
+            count_sql = " UNION ALL ".join(
+                f"SELECT '{table}', COUNT(*) FROM \"{table}\"" for table in tables_to_process
+            )
+            counts = dict(cursor.execute(count_sql).fetchall())
+
+            # All deletes run in a single executescript inside one transaction:
+            # one Python-to-SQLite entry instead of one per table.
+            cursor.executescript(
+                "BEGIN;\n"
+                + ";\n".join(f'DELETE FROM "{table}"' for table in tables_to_process)
+                + ";\nCOMMIT;"
+            )
+
         total_rows_deleted = 0
         for table in tables_to_process:
-            cursor.execute(f"DELETE FROM {table}")
-            rows_deleted = cursor.rowcount
+            rows_deleted = counts[table]
             total_rows_deleted += rows_deleted
             print(f"Deleted {rows_deleted} rows from {table}")
         
-        # Commit all changes
-        conn.commit()
-        
         if table_name:
             print(f"\nSuccessfully removed {total_rows_deleted} rows from table '{table_name}'")
         else:
             print(f"\nSuccessfully removed {total_rows_deleted} rows from {len(tables_to_process)} form tables")
-        
+
     except Exception as e:
-        # Roll back on any error
+        # Roll back on any error; the shared connection stays open
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
 def show_form_tables():
     """Display all form tables from target.db."""
@@ -372,36 +529,43 @@ def scrub_sync_state():
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database file {db_path} does not exist")
 
-    conn = sqlite3.connect(db_path)
+    conn = _get_conn()
     try:
         cursor = conn.cursor()
         form_tables = get_form_tables()
         
-        # Start a transaction for atomicity
-        cursor.execute("BEGIN TRANSACTION")
-        
+        # The update touches every row, so per-table row counts come from
+        # one UNION ALL query and all updates run in a single executescript
+        # inside one transaction.
+        counts = {}
+        if form_tables:
+            count_sql = " UNION ALL ".join(
+                f"SELECT '{table}', COUNT(*) FROM \"{table}\"" for table in form_tables
+            )
+            counts = dict(cursor.execute(count_sql).fetchall())
+
+            cursor.executescript(
+                "BEGIN;\n"
+                + ";\n".join(
+                    f"""UPDATE "{table}"
+                    SET _conflict_type = NULL,
+                        _default_access = 'FULL',
+                        _row_etag = NULL,
+                        _sync_state = 'new_row'"""
+                    for table in form_tables
+                )
+                + ";\nCOMMIT;"
+            )
+
         for table in form_tables:
-            # Update all sync-related columns
-            cursor.execute(f"""
-                UPDATE {table}
-                SET _conflict_type = NULL,
-                    _default_access = 'FULL',
-                    _row_etag = NULL,
-                    _sync_state = 'new_row'
-            """)
-            rows_updated = cursor.rowcount
-            print(f"Updated {rows_updated} rows in {table}")
-        
-        # Commit all changes
-        conn.commit()
+            print(f"Updated {counts[table]} rows in {table}")
+
         print("\nSuccessfully updated sync state in all form tables")
-        
+
     except Exception as e:
-        # Roll back on any error
+        # Roll back on any error; the shared connection stays open
         conn.rollback()
         raise
-    finally:
-        conn.close()
 
 def get_forms_with_attachments() -> List[str]:
     """Get all form tables that have attachment columns (ending with _uriFragment).
@@ -418,34 +582,32 @@ def get_forms_with_attachments() -> List[str]:
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database file {db_path} does not exist")
 
-    conn = sqlite3.connect(db_path)
-    try:
-        cursor = conn.cursor()
-        
-        # Get all tables first
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
-        
-        form_tables_with_attachments = []
-        for (table_name,) in tables:
-            # For each table, check if it has both required columns
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = {col[1] for col in cursor.fetchall()}
-            
-            # Check if it's a form table first
-            if '_form_id' in columns and '_row_etag' in columns:
-                # Then check if it has any uriFragment columns
-                if any(col.endswith('_uriFragment') for col in columns):
-                    form_tables_with_attachments.append(table_name)
-        
-        return sorted(form_tables_with_attachments)
-    finally:
-        conn.close()
+    _, form_tables_with_attachments = _scan_form_tables(db_path, os.path.getmtime(db_path))
+    return list(form_tables_with_attachments)
+
+@functools.lru_cache(maxsize=None)
+def _uri_columns(db_path: str, mtime: float, table_name: str) -> Tuple[Tuple[str, str], ...]:
+    """Get a table's uriFragment columns paired with their contentType siblings.
+
+    Classifies the columns once per schema version (mtime-keyed like the
+    form-table scan) instead of re-running the PRAGMA and endswith scan over
+    every column each time a caller needs them.
+    """
+    cursor = _get_conn().cursor()
+    cursor.execute(f"PRAGMA table_info({_quote_ident(table_name)})")
+    return tuple(
+        (col[1], col[1].replace('_uriFragment', '_contentType'))
+        for col in cursor.fetchall() if col[1].endswith('_uriFragment')
+    )
 
 def get_uri_fragment_columns(cursor, table_name: str) -> List[str]:
-    """Get all column names ending with _uriFragment from a table."""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    return [col[1] for col in cursor.fetchall() if col[1].endswith('_uriFragment')]
+    """Get all column names ending with _uriFragment from a table.
+
+    The cursor argument is kept for API compatibility; lookups are served
+    from the mtime-keyed _uri_columns cache.
+    """
+    db_path = os.path.join('data', 'target.db')
+    return [col for col, _ in _uri_columns(db_path, os.path.getmtime(db_path), table_name)]
 
 def get_expected_attachment_paths() -> Dict[str, Set[str]]:
     """Get all expected attachment paths from the database.
@@ -461,66 +623,110 @@ def get_expected_attachment_paths() -> Dict[str, Set[str]]:
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database file {db_path} does not exist")
 
-    conn = sqlite3.connect(db_path)
     expected_paths: Dict[str, Set[str]] = {}
-    
-    try:
-        cursor = conn.cursor()
-        tables = get_forms_with_attachments()
-        
-        for table in tables:
-            # Get all uriFragment columns for this table
-            uri_columns = get_uri_fragment_columns(cursor, table)
-            table_paths = set()
-            
-            # Build a query that selects rows where any uriFragment column is not null
-            uri_conditions = " OR ".join(f"{col} IS NOT NULL" for col in uri_columns)
-            query = f"""
-                SELECT _form_id, _id, {', '.join(uri_columns)}
-                FROM {table}
-                WHERE {uri_conditions}
-            """
-            
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                form_id = row[0]
-                row_id = row[1].replace(':', '_').replace('-', '_')
-                
-                # Check each uriFragment column in this row
-                for i, uri_column in enumerate(uri_columns, start=2):
-                    uri_fragment = row[i]
-                    if uri_fragment:  # Skip empty/null values
-                        # Include 'instances' in the path to match the actual file system structure
-                        expected_path = os.path.join('data', 'attachments', form_id, 'instances', row_id, uri_fragment)
-                        table_paths.add(expected_path)
-            
-            if table_paths:
-                expected_paths[table] = table_paths
-    
-    finally:
-        conn.close()
-    
+
+    cursor = _get_conn().cursor()
+    tables = get_forms_with_attachments()
+
+    for table in tables:
+        # Get all uriFragment columns for this table
+        uri_columns = get_uri_fragment_columns(cursor, table)
+        table_paths = set()
+
+        # Build a query that selects rows where any uriFragment column is not null
+        quoted_uri_columns = [_quote_ident(col) for col in uri_columns]
+        uri_conditions = " OR ".join(f"{col} IS NOT NULL" for col in quoted_uri_columns)
+        query = f"""
+            SELECT _form_id, _id, {', '.join(quoted_uri_columns)}
+            FROM {_quote_ident(table)}
+            WHERE {uri_conditions}
+        """
+
+        # Iterate the cursor directly so rows stream in chunks instead
+        # of materializing the whole result set before path building.
+        cursor.arraysize = 1000
+        cursor.execute(query)
+
+        add = table_paths.add
+        uri_indexes = range(2, 2 + len(uri_columns))
+        for row in cursor:
+            row_id = row[1].replace(':', '_').replace('-', '_')
+
+            # Paths are built with forward slashes directly ('instances'
+            # included to match the file system layout), so they are born
+            # normalized and need no separator fixup downstream. One
+            # f-string prefix per row replaces an os.path.join per column.
+            prefix = f"data/attachments/{row[0]}/instances/{row_id}/"
+            for i in uri_indexes:
+                uri_fragment = row[i]
+                if uri_fragment:  # Skip empty/null values
+                    add(prefix + uri_fragment)
+
+        if table_paths:
+            expected_paths[table] = table_paths
+
     return expected_paths
 
+def _iter_files(directory: str):
+    """Yield the path of every file under a directory tree.
+
+    Uses os.scandir, whose DirEntry objects carry cached type information,
+    so the traversal avoids the extra stat call per path that os.walk-based
+    listing incurs.
+    """
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield entry.path
+
 def get_actual_attachment_paths() -> Set[str]:
     """Get all actual attachment files from the attachments directory.
-    
+
     Returns:
         Set[str]: Set of paths to all files in the attachments directory
     """
     attachments_dir = os.path.join('data', 'attachments')
     if not os.path.exists(attachments_dir):
         return set()
-        
-    actual_paths = set()
-    for root, _, files in os.walk(attachments_dir):
-        for file in files:
-            path = os.path.join(root, file)
-            # Normalize path separators to match expected paths
-            actual_paths.add(path.replace('\\', '/'))
-    
+
+    # Normalize path separators to match expected paths
+    return {path.replace('\\', '/') for path in _iter_files(attachments_dir)}
+
+def _scan_attachments(root: str, autofix: bool = False, verbose: bool = True) -> Set[str]:
+    """Walk an attachments tree once, collecting non-empty file paths.
+
+    When autofix is set, zero-byte files are unlinked during the same pass
+    instead of a separate remove_empty_files walk beforehand, so validation
+    traverses the directory tree exactly once.
+
+    Returns:
+        Set[str]: Paths of the non-empty files found, with forward slashes
+    """
+    actual_paths: Set[str] = set()
+    if not os.path.exists(root):
+        return actual_paths
+
+    removed = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif autofix and entry.stat().st_size == 0:
+                    os.unlink(entry.path)
+                    removed.append(entry.path)
+                else:
+                    actual_paths.add(entry.path.replace('\\', '/'))
+
+    if removed and verbose:
+        print("\n".join(f"Removed empty file: {path}" for path in removed))
+        print(f"Removed {len(removed)} empty files")
+
     return actual_paths
 
 def remove_empty_files(directory: str, verbose: bool = True) -> List[str]:
@@ -536,16 +742,21 @@ def remove_empty_files(directory: str, verbose: bool = True) -> List[str]:
     removed_files = []
     if not os.path.exists(directory):
         return removed_files
-        
-    for root, _, files in os.walk(directory):
-        for file in files:
-            path = os.path.join(root, file)
-            if os.path.getsize(path) == 0:
-                os.remove(path)
-                removed_files.append(path)
-                if verbose:
-                    print(f"Removed empty file: {path}")
-    
+
+    # os.scandir's DirEntry carries a cached stat, so size checks don't
+    # pay a second stat syscall per file the way os.walk + getsize does.
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and entry.stat().st_size == 0:
+                    os.remove(entry.path)
+                    removed_files.append(entry.path)
+                    if verbose:
+                        print(f"Removed empty file: {entry.path}")
+
     return removed_files
 
 def remove_empty_dirs(directory: str, verbose: bool = True) -> List[str]:
@@ -591,30 +802,39 @@ def update_missing_attachment_refs(conn: sqlite3.Connection, table: str, missing
     """
     cursor = conn.cursor()
     updates = 0
-    
+
     # Get all uriFragment columns and their matching contentType columns
-    uri_columns = get_uri_fragment_columns(cursor, table)
-    content_type_columns = [col.replace('_uriFragment', '_contentType') for col in uri_columns]
-    
-    # Build a query to find rows with these missing attachments
-    for uri_column, content_type_column in zip(uri_columns, content_type_columns):
-        for path in missing_paths:
-            # Extract the uriFragment from the full path
-            uri_fragment = os.path.basename(path)
-            
-            # Update the row, setting both uriFragment and contentType to NULL
+    # from the cached per-table classification
+    db_path = os.path.join('data', 'target.db')
+    column_pairs = _uri_columns(db_path, os.path.getmtime(db_path), table)
+
+    # Load the missing basenames once into a temp table, then clear each uri
+    # column with a single set-based UPDATE: K+1 statements instead of one
+    # UPDATE per column per missing path, and SQLite probes the lookup once
+    # per scanned row.
+    cursor.execute("CREATE TEMP TABLE missing (uri TEXT PRIMARY KEY)")
+    try:
+        cursor.executemany(
+            "INSERT OR IGNORE INTO missing VALUES (?)",
+            [(os.path.basename(path),) for path in missing_paths]
+        )
+
+        for uri_column, content_type_column in column_pairs:
+            # Update the rows, setting both uriFragment and contentType to NULL
             cursor.execute(f"""
-                UPDATE {table}
-                SET {uri_column} = NULL,
-                    {content_type_column} = NULL
-                WHERE {uri_column} = ?
-            """, (uri_fragment,))
-            
+                UPDATE {_quote_ident(table)}
+                SET {_quote_ident(uri_column)} = NULL,
+                    {_quote_ident(content_type_column)} = NULL
+                WHERE {_quote_ident(uri_column)} IN (SELECT uri FROM missing)
+            """)
+
             if cursor.rowcount > 0:
                 updates += cursor.rowcount
                 if verbose:
-                    print(f"Updated {cursor.rowcount} rows in {table} to remove reference to {uri_fragment}")
-    
+                    print(f"Updated {cursor.rowcount} rows in {table} to remove {uri_column} references to missing files")
+    finally:
+        cursor.execute("DROP TABLE missing")
+
     return updates
 
 def validate_attachments(verbose: bool = True, autofix: bool = False, table: str = None) -> Tuple[Dict[str, List[str]], List[str]]:
@@ -639,20 +859,7 @@ def validate_attachments(verbose: bool = True, autofix: bool = False, table: str
         sqlite3.Error: If there's an error accessing the database
     """
     attachments_dir = os.path.join('data', 'attachments')
-    
-    if autofix and verbose:
-        print("\nPreparing attachments folder...")
-        # If a table is specified, only clean that table's directory
-        target_dir = attachments_dir
-        if table:
-            table_dir = os.path.join(attachments_dir, table)
-            if os.path.exists(table_dir):
-                target_dir = table_dir
-        
-        removed_files = remove_empty_files(target_dir, verbose)
-        if removed_files:
-            print(f"Removed {len(removed_files)} empty files")
-    
+
     if verbose:
         print("\nCollecting expected attachment paths from database...")
     expected_paths_by_table = get_expected_attachment_paths()
@@ -665,28 +872,23 @@ def validate_attachments(verbose: bool = True, autofix: bool = False, table: str
             return {}, []
         expected_paths_by_table = {table: expected_paths_by_table[table]}
     
-    # Normalize all expected paths to use forward slashes for comparison
+    # Expected paths are built with forward slashes already, so no
+    # separator normalization is needed here
     all_expected_paths = {
-        path.replace('\\', '/') 
-        for paths in expected_paths_by_table.values() 
+        path
+        for paths in expected_paths_by_table.values()
         for path in paths
     }
     
     if verbose:
         print("Scanning actual attachment files...")
-    
-    # If a table is specified, only scan that table's directory
-    if table:
-        table_dir = os.path.join(attachments_dir, table)
-        actual_paths = set()
-        if os.path.exists(table_dir):
-            for root, _, files in os.walk(table_dir):
-                for file in files:
-                    path = os.path.join(root, file)
-                    # Normalize path separators to match expected paths
-                    actual_paths.add(path.replace('\\', '/'))
-    else:
-        actual_paths = get_actual_attachment_paths()
+
+    # One pass over the tree records the surviving files and, under
+    # autofix, unlinks zero-byte files as it encounters them instead of a
+    # separate remove_empty_files walk. If a table is specified, only that
+    # table's directory is scanned.
+    scan_root = os.path.join(attachments_dir, table) if table else attachments_dir
+    actual_paths = _scan_attachments(scan_root, autofix=autofix, verbose=verbose)
     
     # Find missing and orphaned files
     missing_files: Dict[str, List[str]] = {}
@@ -694,12 +896,11 @@ def validate_attachments(verbose: bool = True, autofix: bool = False, table: str
         if verbose:
             print(f"\nChecking attachments in table {table_name}...")
         
-        # Normalize paths for comparison
-        normalized_expected = [path.replace('\\', '/') for path in expected]
-        
+        # Membership in the already-walked actual_paths set replaces one
+        # stat syscall per expected path.
         table_missing = [
-            path for path in normalized_expected 
-            if not os.path.exists(path.replace('/', os.sep))
+            path for path in expected
+            if path not in actual_paths
         ]
         
         if table_missing:
@@ -711,23 +912,35 @@ def validate_attachments(verbose: bool = True, autofix: bool = False, table: str
         elif verbose:
             print(f"All attachments present in {table_name}")
     
-    # Find orphaned files - only include files that don't match any expected path
-    orphaned_files = sorted([
-        path for path in actual_paths 
+    # Find orphaned files - only include files that don't match any expected
+    # path. Deterministic order only matters when the list is printed or
+    # removed in sequence, so quiet check-only callers skip the sort.
+    orphaned_files = [
+        path for path in actual_paths
         if path not in all_expected_paths
-    ])
+    ]
+    if verbose or autofix:
+        orphaned_files.sort()
     
     if autofix:
         if orphaned_files:
             if verbose:
                 print("\nRemoving orphaned files...")
+            # Keep the removal loop tight and batch the logging: one joined
+            # print instead of one write per file keeps syscalls per removal
+            # to just the unlink itself.
+            removed = []
+            errors = []
             for path in orphaned_files:
                 try:
-                    os.remove(path)
-                    if verbose:
-                        print(f"Removed orphaned file: {path}")
+                    os.unlink(path)
+                    removed.append(path)
                 except OSError as e:
-                    print(f"Error removing {path}: {e}")
+                    errors.append(f"Error removing {path}: {e}")
+            if verbose and removed:
+                print("\n".join(f"Removed orphaned file: {path}" for path in removed))
+            if errors:
+                print("\n".join(errors))
         
         if verbose:
             print("\nRemoving empty directories...")
@@ -743,24 +956,21 @@ def validate_attachments(verbose: bool = True, autofix: bool = False, table: str
         if missing_files:
             if verbose:
                 print("\nUpdating database to remove references to missing files...")
-            db_path = os.path.join('data', 'target.db')
-            conn = sqlite3.connect(db_path)
+            conn = _get_conn()
             try:
                 conn.execute("BEGIN TRANSACTION")
                 total_updates = 0
-                
+
                 for table_name, paths in missing_files.items():
                     updates = update_missing_attachment_refs(conn, table_name, paths, verbose)
                     total_updates += updates
-                
+
                 conn.commit()
                 if verbose and total_updates:
                     print(f"\nUpdated {total_updates} rows to remove references to missing files")
             except Exception as e:
                 conn.rollback()
                 raise
-            finally:
-                conn.close()
     
     # Print summary
     if verbose:
@@ -824,125 +1034,188 @@ def describe_table_changes(table_name: str):
     if not os.path.exists(target_db_path):
         raise FileNotFoundError(f"Target database file {target_db_path} does not exist")
     
-    # Connect to both databases
-    source_conn = sqlite3.connect(source_db_path)
-    target_conn = sqlite3.connect(target_db_path)
-    
-    try:
-        source_cursor = source_conn.cursor()
-        target_cursor = target_conn.cursor()
-        
-        # Get column definitions from source database
-        source_cursor.execute("""
-            SELECT _element_key, _element_name, _element_type
-            FROM _column_definitions
-            WHERE _table_id = ?
-            ORDER BY _element_key
-        """, (table_name,))
-        source_columns = {row[0]: {'name': row[1], 'type': row[2]} for row in source_cursor.fetchall()}
-        
-        # Get column definitions from target database
-        target_cursor.execute("""
-            SELECT _element_key, _element_name, _element_type
-            FROM _column_definitions
-            WHERE _table_id = ?
-            ORDER BY _element_key
-        """, (table_name,))
-        target_columns = {row[0]: {'name': row[1], 'type': row[2]} for row in target_cursor.fetchall()}
-        
-        # Calculate changes
-        unchanged_columns = []
-        changed_pseudotype_columns = []
-        dropped_columns = []
-        new_columns = []
-        
-        # Find unchanged, changed pseudotype, and dropped columns
-        for col_key, col_info in source_columns.items():
-            if col_key in target_columns:
-                if col_info['type'] == target_columns[col_key]['type']:
-                    unchanged_columns.append(col_key)
-                else:
-                    changed_pseudotype_columns.append({
-                        'column': col_key,
-                        'source_type': col_info['type'],
-                        'target_type': target_columns[col_key]['type']
-                    })
-            else:
-                dropped_columns.append(col_key)
-        
-        # Find new columns
-        for col_key in target_columns:
-            if col_key not in source_columns:
-                new_columns.append(col_key)
-        
-        # Display summary
+    # One pooled connection with the source database attached lets SQLite
+    # compute the whole column diff in a single query instead of
+    # materializing two dicts in Python from two separate connections.
+    conn = _get_db(target_db_path)
+    cursor = conn.cursor()
+
+    # Attach once per process; later calls reuse the attachment
+    if not any(row[1] == 'src' for row in cursor.execute("PRAGMA database_list")):
+        cursor.execute("ATTACH DATABASE ? AS src", (source_db_path,))
+
+    # Cheap short-circuit first: concatenate each side's ordered
+    # (key, type) pairs and compare. Equal summaries mean the schema is
+    # unchanged, so the detailed diff below never runs. The concatenated
+    # strings are compared directly - hashing them first would only add
+    # work on top of strings we already hold.
+    digest_sql = """
+        SELECT group_concat(_element_key || ':' || _element_type, '|')
+        FROM (SELECT _element_key, _element_type
+              FROM {}._column_definitions
+              WHERE _table_id = ? ORDER BY _element_key)
+    """
+    source_digest = cursor.execute(digest_sql.format('src'), (table_name,)).fetchone()[0]
+    target_digest = cursor.execute(digest_sql.format('main'), (table_name,)).fetchone()[0]
+
+    if source_digest == target_digest:
+        column_count = 0 if source_digest is None else source_digest.count('|') + 1
         print(f"\nTable Changes Summary for '{table_name}':")
         print("=" * 50)
-        
-        print(f"{len(unchanged_columns)} columns unchanged.")
-        
-        if changed_pseudotype_columns:
-            print(f"{len(changed_pseudotype_columns)} columns changed pseudo type:")
-            for change in changed_pseudotype_columns:
-                print(f"  - {change['column']}: {change['source_type']} -> {change['target_type']}")
-        
-        if dropped_columns:
-            print(f"{len(dropped_columns)} columns dropped:")
-            for col in dropped_columns:
-                print(f"  - {col}")
-        
-        if new_columns:
-            print(f"{len(new_columns)} new columns:")
-            for col in new_columns:
-                print(f"  - {col}")
-        
+        print(f"{column_count} columns unchanged.")
         print("=" * 50)
-        
-    finally:
-        source_conn.close()
-        target_conn.close()
+        return
+
+    # Left join source onto target for unchanged/changed/dropped, then
+    # append the target-only (new) columns; a NULL on either side tells
+    # the classification pass which case a row is.
+    cursor.execute("""
+        SELECT s._element_key, s._element_type, t._element_type
+        FROM (SELECT _element_key, _element_type
+              FROM src._column_definitions WHERE _table_id = ?) s
+        LEFT JOIN (SELECT _element_key, _element_type
+                   FROM main._column_definitions WHERE _table_id = ?) t
+            USING (_element_key)
+        UNION ALL
+        SELECT _element_key, NULL, _element_type
+        FROM main._column_definitions
+        WHERE _table_id = ?
+          AND _element_key NOT IN (SELECT _element_key
+                                   FROM src._column_definitions
+                                   WHERE _table_id = ?)
+        ORDER BY 1
+    """, (table_name, table_name, table_name, table_name))
+
+    # Calculate changes in a single pass over the joined rows
+    unchanged_columns = []
+    changed_pseudotype_columns = []
+    dropped_columns = []
+    new_columns = []
+
+    for col_key, source_type, target_type in cursor:
+        if source_type is None:
+            new_columns.append(col_key)
+        elif target_type is None:
+            dropped_columns.append(col_key)
+        elif source_type == target_type:
+            unchanged_columns.append(col_key)
+        else:
+            changed_pseudotype_columns.append((col_key, source_type, target_type))
+
+    # Display summary as one buffered write instead of a print per line
+    lines = [f"\nTable Changes Summary for '{table_name}':", "=" * 50,
+             f"{len(unchanged_columns)} columns unchanged."]
+
+    if changed_pseudotype_columns:
+        lines.append(f"{len(changed_pseudotype_columns)} columns changed pseudo type:")
+        lines.extend(f"  - {col}: {source_type} -> {target_type}"
+                     for col, source_type, target_type in changed_pseudotype_columns)
+
+    if dropped_columns:
+        lines.append(f"{len(dropped_columns)} columns dropped:")
+        lines.extend(f"  - {col}" for col in dropped_columns)
+
+    if new_columns:
+        lines.append(f"{len(new_columns)} new columns:")
+        lines.extend(f"  - {col}" for col in new_columns)
+
+    lines.append("=" * 50)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+# Full help text baked once at import; help() emits it with a single write
+# instead of ~30 individual print calls.
+_HELP_TEXT = f"""
+Available Helper Functions:
+{'=' * 50}
+ensure_data_directory         - Ensure the data directory exists.
+pull_database                 - Pull the ODK-X database from the connected Android device to data/target.db.
+push_database                 - Push the local database (data/target.db) to the connected Android device.
+clean_device_db               - Clean up the ODK-X database and temporary files on the device.
+get_form_tables               - Get all tables from target.db that have both _form_id and _row_etag columns.
+remove_instance_rows          - Remove all rows from form tables in the local target database (data/target.db).
+show_form_tables              - Display all form tables from target.db.
+scrub_sync_state              - Update sync state columns in all form tables to their default values.
+get_forms_with_attachments    - Get all form tables that have attachment columns.
+get_uri_fragment_columns      - Get all column names ending with _uriFragment from a table.
+get_expected_attachment_paths - Get all expected attachment paths from the database.
+get_actual_attachment_paths   - Get all actual attachment files from the attachments directory.
+remove_empty_files            - Remove all zero-byte files from a directory and its subdirectories.
+See also:
+  Attachment resizing and analysis tools:
+    python resize.py --help
+    (resize_images, get_sizes, get_detailed_sizes)
+remove_empty_dirs             - Remove empty directories recursively.
+update_missing_attachment_refs - Update database rows to clear references to missing attachments.
+validate_attachments          - Validate attachments and identify orphaned files.
+show_forms_with_attachments   - Display all form tables that have attachment columns.
+describe_table_changes        - Describe changes to a table based on column definitions comparison.
+help                          - Display all available helper functions with their descriptions.
+migrate                       - Run the database migration process.
+preflight_check               - Check for and remove 0KB files on the connected Android device.
+"""
 
 def help():
     """Display all available helper functions with their descriptions."""
-    print("\nAvailable Helper Functions:")
-    print("=" * 50)
-    print("ensure_data_directory         - Ensure the data directory exists.")
-    print("pull_database                 - Pull the ODK-X database from the connected Android device to data/target.db.")
-    print("push_database                 - Push the local database (data/target.db) to the connected Android device.")
-    print("clean_device_db               - Clean up the ODK-X database and temporary files on the device.")
-    print("get_form_tables               - Get all tables from target.db that have both _form_id and _row_etag columns.")
-    print("remove_instance_rows          - Remove all rows from form tables in the local target database (data/target.db).")
-    print("show_form_tables              - Display all form tables from target.db.")
-    print("scrub_sync_state              - Update sync state columns in all form tables to their default values.")
-    print("get_forms_with_attachments    - Get all form tables that have attachment columns.")
-    print("get_uri_fragment_columns      - Get all column names ending with _uriFragment from a table.")
-    print("get_expected_attachment_paths - Get all expected attachment paths from the database.")
-    print("get_actual_attachment_paths   - Get all actual attachment files from the attachments directory.")
-    print("remove_empty_files            - Remove all zero-byte files from a directory and its subdirectories.")
-    print("See also:")
-    print("  Attachment resizing and analysis tools:")
-    print("    python resize.py --help")
-    print("    (resize_images, get_sizes, get_detailed_sizes)")
-    print("remove_empty_dirs             - Remove empty directories recursively.")
-    print("update_missing_attachment_refs - Update database rows to clear references to missing attachments.")
-    print("validate_attachments          - Validate attachments and identify orphaned files.")
-    print("show_forms_with_attachments   - Display all form tables that have attachment columns.")
-    print("describe_table_changes        - Describe changes to a table based on column definitions comparison.")
-    print("help                          - Display all available helper functions with their descriptions.")
-    print("migrate                       - Run the database migration process.")
-    print("preflight_check               - Check for and remove 0KB files on the connected Android device.")
-    print("describe_table_changes        - Describe changes to a table based on column definitions comparison.")
-
-def execute_sql_source(sql: str, verbose: bool = True):
+    sys.stdout.write(_HELP_TEXT)
+
+def _execute_sql(cursor, sql: str, label: str, verbose: bool, collect: bool):
+    """Execute SQL on a cursor, streaming output in fetchmany batches.
+
+    Rows stream in chunks of 1000 so memory stays bounded regardless of
+    result size, and each chunk is written to stdout with a single joined
+    write instead of one print per row.
+
+    Returns:
+        The collected rows when collect is True, otherwise None
+    """
+    if verbose:
+        print(f"Executing SQL on {label} database: {sql}")
+
+    cursor.execute(sql)
+
+    # Get column names
+    column_names = [description[0] for description in cursor.description] if cursor.description else []
+
+    collected = [] if collect else None
+    total_rows = 0
+    header_printed = False
+    out = sys.stdout.write
+
+    while True:
+        batch = cursor.fetchmany(1000)
+        if not batch:
+            break
+        total_rows += len(batch)
+        if collect:
+            collected.extend(batch)
+        if verbose:
+            if not header_printed:
+                header = " | ".join(column_names)
+                out(f"\n{header}\n{'-' * len(header)}\n")
+                header_printed = True
+            out("\n".join(" | ".join(str(value) for value in row) for row in batch))
+            out("\n")
+
+    if verbose:
+        if total_rows == 0:
+            print("No results returned")
+        else:
+            print(f"\nTotal rows: {total_rows}")
+
+    return collected
+
+def execute_sql_source(sql: str, verbose: bool = True, collect: bool = True):
     """Execute SQL query against the source database.
-    
+
     Args:
         sql: SQL query to execute
         verbose: If True, print detailed output
-    
+        collect: If True, accumulate and return the rows; pass False for
+                 print-only callers so large result sets never build a list
+
     Returns:
-        List of rows returned by the query
-        
+        List of rows returned by the query, or None when collect is False
+
     Raises:
         FileNotFoundError: If the database file doesn't exist
         sqlite3.Error: If there's an error executing the SQL
@@ -950,98 +1223,26 @@ def execute_sql_source(sql: str, verbose: bool = True):
     db_path = os.path.join('data', 'source.db')
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database file {db_path} does not exist")
-    
-    conn = sqlite3.connect(db_path)
-    try:
-        cursor = conn.cursor()
-        
-        if verbose:
-            print(f"Executing SQL on source database: {sql}")
-        
-        cursor.execute(sql)
-        
-        # Get column names
-        column_names = [description[0] for description in cursor.description] if cursor.description else []
-        
-        # Fetch all rows
-        rows = cursor.fetchall()
-        
-        if verbose:
-            if not rows:
-                print("No results returned")
-            else:
-                # Print column headers
-                header = " | ".join(column_names)
-                separator = "-" * len(header)
-                print(f"\n{header}")
-                print(separator)
-                
-                # Print rows
-                for row in rows:
-                    formatted_row = " | ".join(str(value) for value in row)
-                    print(formatted_row)
-                
-                print(f"\nTotal rows: {len(rows)}")
-        
-        return rows
-    
-    finally:
-        conn.close()
 
-def execute_sql_target(sql: str, verbose: bool = True):
+    return _execute_sql(_get_db(db_path).cursor(), sql, "source", verbose, collect)
+
+def execute_sql_target(sql: str, verbose: bool = True, collect: bool = True):
     """Execute SQL query against the target database.
-    
+
     Args:
         sql: SQL query to execute
         verbose: If True, print detailed output
-    
+        collect: If True, accumulate and return the rows; pass False for
+                 print-only callers so large result sets never build a list
+
     Returns:
-        List of rows returned by the query
-        
+        List of rows returned by the query, or None when collect is False
+
     Raises:
         FileNotFoundError: If the database file doesn't exist
         sqlite3.Error: If there's an error executing the SQL
     """
-    db_path = os.path.join('data', 'target.db')
-    if not os.path.exists(db_path):
-        raise FileNotFoundError(f"Database file {db_path} does not exist")
-    
-    conn = sqlite3.connect(db_path)
-    try:
-        cursor = conn.cursor()
-        
-        if verbose:
-            print(f"Executing SQL on target database: {sql}")
-        
-        cursor.execute(sql)
-        
-        # Get column names
-        column_names = [description[0] for description in cursor.description] if cursor.description else []
-        
-        # Fetch all rows
-        rows = cursor.fetchall()
-        
-        if verbose:
-            if not rows:
-                print("No results returned")
-            else:
-                # Print column headers
-                header = " | ".join(column_names)
-                separator = "-" * len(header)
-                print(f"\n{header}")
-                print(separator)
-                
-                # Print rows
-                for row in rows:
-                    formatted_row = " | ".join(str(value) for value in row)
-                    print(formatted_row)
-                
-                print(f"\nTotal rows: {len(rows)}")
-        
-        return rows
-    
-    finally:
-        conn.close()
+    return _execute_sql(_get_conn().cursor(), sql, "target", verbose, collect)
 
 def migrate(table_name=None, verbose=False):
     """
@@ -1088,7 +1289,16 @@ def migrate(table_name=None, verbose=False):
     try:
         # Initialize migrator
         migrator = DatabaseMigrator(SCHEMA_CONFIG)
-        
+
+        # Bulk-load tuning for the target connection: WAL avoids rewriting
+        # the rollback journal per transaction and synchronous=NORMAL drops
+        # the fsync per commit to one per WAL checkpoint. migrate_table
+        # already wraps each insert batch in BEGIN/COMMIT, so commits stay
+        # few; this makes each of them cheap as well.
+        migrator.target_db.execute("PRAGMA journal_mode=WAL")
+        migrator.target_db.execute("PRAGMA synchronous=NORMAL")
+        migrator.target_db.execute("PRAGMA temp_store=MEMORY")
+
         # Set the verbose mode on the migrator
         migrator.verbose_mode = verbose
         
@@ -1106,6 +1316,7 @@ def migrate(table_name=None, verbose=False):
             if total_records > 0:
                 # Create a progress bar
                 with tqdm(total=total_records, desc=f"Migrating {table_name}", ncols=100,
+                          mininterval=0.2, miniters=1000,
                           bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]') as pbar:
                     # Store original stats
                     original_count = migrator.migration_stats["total_records_migrated"]
@@ -1140,40 +1351,43 @@ def migrate(table_name=None, verbose=False):
             # First, show the table counts and get user confirmation
             migrator._print_table_counts("Before Migration")
             
-            # Get table names from both databases
-            source_tables = migrator.get_table_names(migrator.source_db)
-            target_tables = migrator.get_table_names(migrator.target_db)
+            # Get table names once from each database; the three set
+            # operations below reuse the same hashed sets
+            source_tables = frozenset(migrator.get_table_names(migrator.source_db))
+            target_tables = frozenset(migrator.get_table_names(migrator.target_db))
             
             # Find tables that exist in both databases
-            common_tables = source_tables.intersection(target_tables)
+            common_tables = source_tables & target_tables
             
-            # Log table differences
-            source_only = source_tables - target_tables
-            target_only = target_tables - source_tables
+            # Log table differences (sorted for stable output)
+            source_only = sorted(source_tables - target_tables)
+            target_only = sorted(target_tables - source_tables)
             
             if source_only:
                 logging.info(f"\nTables in source but not in target: {', '.join(source_only)}")
-                migrator.migration_stats["source_only_tables"] = list(source_only)
+                migrator.migration_stats["source_only_tables"] = source_only
             if target_only:
                 logging.info(f"Tables in target but not in source: {', '.join(target_only)}")
-                migrator.migration_stats["target_only_tables"] = list(target_only)
+                migrator.migration_stats["target_only_tables"] = target_only
             
-            # Create a single progress bar for all tables
-            tables_to_migrate = list(common_tables)
+            # Create a single progress bar for all tables; sorting keeps
+            # migration order (and therefore logs) reproducible run to run
+            tables_to_migrate = sorted(common_tables)
             total_tables = len(tables_to_migrate)
             
             logging.info(f"\nMigrating {total_tables} tables...")
             
-            # Count total records to migrate for better progress estimation
-            total_records = 0
-            table_record_counts = {}
-            
-            for table_name in tables_to_migrate:
-                cursor = migrator.source_db.cursor()
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                record_count = cursor.fetchone()[0]
-                table_record_counts[table_name] = record_count
-                total_records += record_count
+            # Count total records to migrate for better progress estimation.
+            # One UNION ALL query returns every table's count in a single
+            # round-trip instead of one COUNT(*) statement per table; the
+            # names come straight from get_table_names, so quoting them is
+            # the only sanitation needed.
+            count_sql = " UNION ALL ".join(
+                f"SELECT '{t}', COUNT(*) FROM \"{t}\"" for t in tables_to_migrate
+            )
+            cursor = migrator.source_db.cursor()
+            table_record_counts = dict(cursor.execute(count_sql).fetchall()) if tables_to_migrate else {}
+            total_records = sum(table_record_counts.values())
             
             logging.info(f"Total records to migrate: {total_records}")
             
@@ -1185,37 +1399,41 @@ def migrate(table_name=None, verbose=False):
                 raise
             
             # Clear the console to make room for the progress bar
-            os.system('cls' if os.name == 'nt' else 'clear')
+            _clear_screen()
             
             # Silence all loggers during migration to avoid interference with progress bar
             root_logger.setLevel(logging.ERROR)
             
-            # Create overall progress bar
+            # Create overall progress bar. Independent tables migrate in
+            # parallel: source reads and row transformation overlap across
+            # threads while the migrator serializes target write
+            # transactions internally.
+            max_workers = min(4, os.cpu_count() or 1, max(1, total_tables))
+            # mininterval/miniters throttle repaints so tqdm rendering does
+            # not steal time from the migration loop on large tables
             with tqdm(total=total_records, desc="Total migration progress", ncols=100,
+                      mininterval=0.2, miniters=1000,
                       bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]') as overall_bar:
                 records_migrated = 0
-                
-                # Migrate common tables
-                for table_name in tables_to_migrate:
-                    # Update progress bar description
-                    overall_bar.set_description(f"Migrating {table_name} ({records_migrated}/{total_records} records)")
-                    
-                    # Store the original total_records_migrated count
-                    original_count = migrator.migration_stats["total_records_migrated"]
-                    
-                    # Migrate the table
-                    migrator.migrate_table(table_name)
-                    
-                    # Calculate how many records were actually migrated
-                    new_count = migrator.migration_stats["total_records_migrated"]
-                    records_migrated_for_table = new_count - original_count
-                    
-                    # Update the overall progress bar
-                    overall_bar.update(records_migrated_for_table)
-                    records_migrated += records_migrated_for_table
-                    
-                    # Update migration stats
-                    migrator.migration_stats["tables_migrated"] += 1
+
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(migrator.migrate_table, t): t
+                               for t in tables_to_migrate}
+                    for future in as_completed(futures):
+                        migrated_table = futures[future]
+                        records_migrated_for_table = future.result() or 0
+
+                        # Update the overall progress bar
+                        records_migrated += records_migrated_for_table
+                        # refresh=False defers the repaint to the update()
+                        # call that follows, so each table costs one render
+                        overall_bar.set_description_str(
+                            f"Migrated {migrated_table} ({records_migrated}/{total_records} records)",
+                            refresh=False)
+                        overall_bar.update(records_migrated_for_table)
+
+                        # Update migration stats
+                        migrator.migration_stats["tables_migrated"] += 1
             
             # Update village values in hh_person table
             migrator.update_person_villages()
@@ -1322,108 +1540,108 @@ def preflight_check():
         print("Preflight check failed. DO NOT proceed with sync until this issue is resolved.")
         sys.exit(1)
 
+def _cmd_pull_database(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Pull database from device")
+    parser.add_argument("--file", type=str, help="Output filename (default: target.db)")
+    args, _ = parser.parse_known_args(argv)
+    pull_database(args.file)
+
+def _cmd_push_attachments(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Push attachments to device")
+    parser.add_argument("--force", action="store_true",
+                        help="Push all files even if unchanged on the device")
+    args, _ = parser.parse_known_args(argv)
+    push_attachments(force=args.force)
+
+def _cmd_remove_instance_rows(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Remove instance rows")
+    parser.add_argument("--table", type=str, help="Remove rows from a specific table")
+    args, _ = parser.parse_known_args(argv)
+    remove_instance_rows(table_name=args.table)
+
+def _cmd_validate_attachments(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Validate attachments")
+    parser.add_argument("--autofix", action="store_true", help="Automatically fix issues")
+    parser.add_argument("--table", type=str, help="Validate attachments for a specific table")
+    args, _ = parser.parse_known_args(argv)
+    validate_attachments(autofix=args.autofix, table=args.table)
+
+def _cmd_fix_attachments(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Fix attachment issues")
+    parser.add_argument("--table", type=str, help="Fix attachments for a specific table")
+    args, _ = parser.parse_known_args(argv)
+    validate_attachments(autofix=True, table=args.table)
+
+def _cmd_execute_sql_source(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Execute SQL on source database")
+    parser.add_argument("--sql", type=str, required=True, help="SQL query to execute")
+    args, _ = parser.parse_known_args(argv)
+    execute_sql_source(args.sql, collect=False)
+
+def _cmd_execute_sql_target(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Execute SQL on target database")
+    parser.add_argument("--sql", type=str, required=True, help="SQL query to execute")
+    args, _ = parser.parse_known_args(argv)
+    execute_sql_target(args.sql, collect=False)
+
+def _cmd_migrate(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the database migration process")
+    parser.add_argument("--table", help="Specific table to migrate")
+    parser.add_argument("--verbose", action="store_true", help="Show detailed log messages during migration")
+    args, _ = parser.parse_known_args(argv)
+    migrate(args.table, verbose=args.verbose)
+
+def _cmd_describe_table_changes(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Describe changes to a table based on column definitions")
+    parser.add_argument("--table", required=True, help="Table name to analyze")
+    args, _ = parser.parse_known_args(argv)
+    describe_table_changes(args.table)
+
+# Command registry: one dict lookup replaces the old if/elif ladder.
+# Commands that take no arguments ignore the argv list they receive.
+COMMANDS = {
+    "help": lambda argv: help(),
+    "ensure_data_directory": lambda argv: ensure_data_directory(),
+    "pull_database": _cmd_pull_database,
+    "push_database": lambda argv: push_database(),
+    "clean_device_db": lambda argv: clean_device_db(),
+    # For backward compatibility
+    "clean_db_tempfiles": lambda argv: clean_device_db(),
+    "preflight_check": lambda argv: preflight_check(),
+    "push_attachments": _cmd_push_attachments,
+    "show_form_tables": lambda argv: show_form_tables(),
+    "show_forms_with_attachments": lambda argv: show_forms_with_attachments(),
+    "remove_instance_rows": _cmd_remove_instance_rows,
+    "scrub_sync_state": lambda argv: scrub_sync_state(),
+    "validate_attachments": _cmd_validate_attachments,
+    "fix_attachments": _cmd_fix_attachments,
+    "execute_sql_source": _cmd_execute_sql_source,
+    "execute_sql_target": _cmd_execute_sql_target,
+    "migrate": _cmd_migrate,
+    "describe_table_changes": _cmd_describe_table_changes,
+}
+
 def main():
     if len(sys.argv) < 2:
         help()
         return
-    
+
     command = sys.argv[1]
-    
-    if command == "help":
-        help()
-    elif command == "ensure_data_directory":
-        ensure_data_directory()
-    elif command == "pull_database":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Pull database from device")
-        parser.add_argument("--file", type=str, help="Output filename (default: target.db)")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        pull_database(args.file)
-    elif command == "push_database":
-        push_database()
-    
-    elif command == "clean_device_db":
-        clean_device_db()
-    elif command == "clean_db_tempfiles":
-        # For backward compatibility
-        clean_device_db()
-    
-    elif command == "preflight_check":
-        preflight_check()
-        
-    elif command == "push_attachments":
-        push_attachments()
-    
-    elif command == "show_form_tables":
-        show_form_tables()
-    
-    elif command == "show_forms_with_attachments":
-        show_forms_with_attachments()
-    
-    elif command == "remove_instance_rows":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Remove instance rows")
-        parser.add_argument("--table", type=str, help="Remove rows from a specific table")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        remove_instance_rows(table_name=args.table)
-    
-    elif command == "scrub_sync_state":
-        scrub_sync_state()
-    
-    elif command == "validate_attachments":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Validate attachments")
-        parser.add_argument("--autofix", action="store_true", help="Automatically fix issues")
-        parser.add_argument("--table", type=str, help="Validate attachments for a specific table")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        validate_attachments(autofix=args.autofix, table=args.table)
-    
-    elif command == "fix_attachments":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Fix attachment issues")
-        parser.add_argument("--table", type=str, help="Fix attachments for a specific table")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        validate_attachments(autofix=True, table=args.table)
-    
-    elif command == "execute_sql_source":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Execute SQL on source database")
-        parser.add_argument("--sql", type=str, required=True, help="SQL query to execute")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        execute_sql_source(args.sql)
-    
-    elif command == "execute_sql_target":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Execute SQL on target database")
-        parser.add_argument("--sql", type=str, required=True, help="SQL query to execute")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        execute_sql_target(args.sql)
-    
-    elif command == "migrate":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Run the database migration process")
-        parser.add_argument("--table", help="Specific table to migrate")
-        parser.add_argument("--verbose", action="store_true", help="Show detailed log messages during migration")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        migrate(args.table, verbose=args.verbose)
-    elif command == "describe_table_changes":
-        # Parse arguments
-        parser = argparse.ArgumentParser(description="Describe changes to a table based on column definitions")
-        parser.add_argument("--table", required=True, help="Table name to analyze")
-        args, _ = parser.parse_known_args(sys.argv[2:])
-        
-        describe_table_changes(args.table)
-    
-    else:
+    fn = COMMANDS.get(command)
+    if fn is None:
         print(f"Unknown command: {command}")
         print("Use 'help' to see available commands")
+        return
+    fn(sys.argv[2:])
 
 if __name__ == '__main__':
     main()
@@ -3,8 +3,12 @@ import os
 import sys
 from typing import Dict, List, Tuple
 import argparse
+import io
 import shutil
-from collections import defaultdict, Counter
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
 from tqdm import tqdm
 
 # Try to import progress_bar_iter, but don't fail if it's not available
@@ -19,8 +23,14 @@ except ImportError:
 PIL_AVAILABLE = False
 PIEXIF_AVAILABLE = False
 try:
-    from PIL import Image, ExifTags
+    from PIL import Image, ImageOps
     PIL_AVAILABLE = True
+    # Resolve the resampling filter once; on modern Pillow the bare
+    # Image.LANCZOS name goes through a deprecation __getattr__ shim
+    try:
+        _LANCZOS = Image.Resampling.LANCZOS
+    except AttributeError:
+        _LANCZOS = Image.LANCZOS
     try:
         import piexif
         PIEXIF_AVAILABLE = True
@@ -29,20 +39,152 @@ try:
 except ImportError:
     pass
 
-def get_file_size(file_path: str) -> int:
-    """Get the size of a file in bytes."""
-    return os.path.getsize(file_path)
+# pyvips (libvips) is optional: when installed, JPEG resizes run through
+# its streaming shrink-on-load pipeline instead of Pillow
+PYVIPS_AVAILABLE = False
+try:
+    import pyvips
+    PYVIPS_AVAILABLE = True
+except ImportError:
+    pass
+
+def _scan_dir(path: str) -> Tuple[List[str], List[Tuple[str, int]]]:
+    """List one directory, returning (subdirectories, [(file_path, size)]).
+
+    scandir's DirEntry carries the stat result gathered during the
+    directory read, so no separate getsize call per file is needed.
+    """
+    subdirs = []
+    files = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+    except OSError:
+        pass
+    return subdirs, files
+
+# Scan results cached per root: running both summaries in one process
+# walks (and stats) the tree once instead of twice. resize_images bypasses
+# the cache since it changes the files it scans.
+_scan_cache: Dict[str, List[Tuple[str, int]]] = {}
+
+def _scan_files(root: str, use_cache: bool = True) -> List[Tuple[str, int]]:
+    """Collect (path, size) for every file under root.
+
+    Directories are listed from a thread pool so stat latency overlaps
+    across many instance folders instead of being paid serially; the
+    attachment trees are wide (one directory per instance), which is the
+    shape this fans out well on.
+    """
+    if use_cache and root in _scan_cache:
+        return _scan_cache[root]
+    results = []
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_dir, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subdirs, files = future.result()
+                results.extend(files)
+                for subdir in subdirs:
+                    pending.add(executor.submit(_scan_dir, subdir))
+    if use_cache:
+        _scan_cache[root] = results
+    return results
+
+# Extension sets hoisted to module level: one lowered extension per file
+# checked against a frozenset instead of rebuilding list literals (and
+# re-lowering) at each membership test
+_IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'})
+_RESIZE_EXTS = frozenset({'.jpg', '.jpeg', '.png'})
+_JPEG_EXTS = frozenset({'.jpg', '.jpeg'})
+
+# Standardized EXIF tag number for Orientation; fixed by the EXIF spec
+_ORIENTATION_TAG = 0x0112
+
+# Unit thresholds precomputed once; format_size runs per file row in the
+# detailed summary
+_SIZE_UNITS = (('GB', 1024 ** 3), ('MB', 1024 ** 2), ('KB', 1024))
 
 def format_size(size_bytes: int) -> str:
     """Format a size in bytes to a human-readable string."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    for unit, divisor in _SIZE_UNITS:
+        if size_bytes >= divisor:
+            return f"{size_bytes / divisor:.2f} {unit}"
+    return f"{size_bytes} B"
+
+def _fast_image_size(path: str, ext: str):
+    """Read image dimensions straight from the file header.
+
+    Parses just enough of the JPEG/PNG/GIF/BMP header to find the pixel
+    dimensions, skipping Pillow's per-file object construction (and, for
+    progressive JPEGs, a much more expensive setup path). Returns
+    (width, height), or None when the header can't be parsed - callers
+    fall back to Image.open.
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(26)
+            if ext in _JPEG_EXTS:
+                if head[:2] != b'\xff\xd8':
+                    return None
+                # Walk the segment chain to a start-of-frame marker, which
+                # carries the dimensions
+                f.seek(2)
+                while True:
+                    marker = f.read(4)
+                    if len(marker) < 4 or marker[0] != 0xFF:
+                        return None
+                    code = marker[1]
+                    length = (marker[2] << 8) | marker[3]
+                    if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                        data = f.read(5)
+                        if len(data) < 5:
+                            return None
+                        height = (data[1] << 8) | data[2]
+                        width = (data[3] << 8) | data[4]
+                        return width, height
+                    f.seek(length - 2, 1)
+            elif ext == '.png':
+                if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+                    return (int.from_bytes(head[16:20], 'big'),
+                            int.from_bytes(head[20:24], 'big'))
+            elif ext == '.gif':
+                if head[:6] in (b'GIF87a', b'GIF89a'):
+                    return (int.from_bytes(head[6:8], 'little'),
+                            int.from_bytes(head[8:10], 'little'))
+            elif ext == '.bmp':
+                if head[:2] == b'BM':
+                    return (int.from_bytes(head[18:22], 'little'),
+                            abs(int.from_bytes(head[22:26], 'little', signed=True)))
+    except OSError:
+        pass
+    return None
+
+# Sidecar cache of probed image dimensions keyed by (path, size, mtime).
+# Attachments rarely change between runs, so warm get_sizes runs skip the
+# header probe entirely.
+_DIM_CACHE_PATH = os.path.join('data', '.dim_cache.sqlite')
+
+def _open_dim_cache():
+    """Open (creating if needed) the sidecar dimension cache.
+
+    Returns a sqlite3 connection, or None when the cache can't be opened
+    (e.g. a read-only data directory) - callers then probe every file.
+    """
+    try:
+        conn = sqlite3.connect(_DIM_CACHE_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dims "
+            "(path TEXT PRIMARY KEY, size INTEGER, mtime REAL, dims TEXT)")
+        return conn
+    except sqlite3.Error:
+        return None
 
 def get_sizes(test_all=False):
     """Print a summary of the sizes of each folder under data/attachments.
@@ -76,8 +218,17 @@ def get_sizes(test_all=False):
     grand_total_files = 0
     all_dimensions = Counter()
     
+    # One threaded scan of the whole tree serves every table below (and
+    # get_detailed_sizes, should it run in the same process)
+    table_prefix = attachments_dir + os.sep
+    files_by_table = {t: [] for t in tables}
+    dim_cache = _open_dim_cache()
+    for file_path, file_size in _scan_files(attachments_dir):
+        table_name = file_path[len(table_prefix):].split(os.sep, 1)[0]
+        if table_name in files_by_table:
+            files_by_table[table_name].append((file_path, file_size))
+    
     for table in tables:
-        table_dir = os.path.join(attachments_dir, table)
         table_size = 0
         file_count = 0
         dimensions_counter = Counter()
@@ -85,36 +236,49 @@ def get_sizes(test_all=False):
         # Track how many images we've processed for this table (for quick mode)
         images_processed = 0
         
-        # Walk through all subdirectories
-        for root, _, files in os.walk(table_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_size = get_file_size(file_path)
-                table_size += file_size
-                file_count += 1
-                
-                # Get image dimensions if it's an image file
-                _, ext = os.path.splitext(file)
-                if PIL_AVAILABLE and ext.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
-                    # By default, only process the first 10 images per table
-                    # If test_all is True, process all images
-                    if not test_all and images_processed >= 10:
-                        continue
-                        
-                    try:
-                        with Image.open(file_path) as img:
-                            width, height = img.size
-                            # Format as greatest_dimension x smallest_dimension
-                            if width >= height:
-                                dimensions = f"{width}x{height}"
-                            else:
-                                dimensions = f"{height}x{width}"
-                            dimensions_counter[dimensions] += 1
-                            all_dimensions[dimensions] += 1
-                            images_processed += 1
-                    except Exception:
-                        # Skip files that can't be opened as images
-                        pass
+        for file_path, file_size in files_by_table[table]:
+            table_size += file_size
+            file_count += 1
+            
+            # By default, only size the first 10 images per table; once
+            # that sample is in, the remaining files only contribute
+            # their byte counts, so skip even the extension test
+            if not test_all and images_processed >= 10:
+                continue
+            
+            # Get image dimensions if it's an image file
+            ext = os.path.splitext(file_path)[1].lower()
+            if PIL_AVAILABLE and ext in _IMAGE_EXTS:
+                try:
+                    mtime = os.stat(file_path).st_mtime
+                    dimensions = None
+                    if dim_cache is not None:
+                        row = dim_cache.execute(
+                            "SELECT dims FROM dims WHERE path=? AND size=? AND mtime=?",
+                            (file_path, file_size, mtime)).fetchone()
+                        if row:
+                            dimensions = row[0]
+                    if dimensions is None:
+                        probed = _fast_image_size(file_path, ext)
+                        if probed is None:
+                            with Image.open(file_path) as img:
+                                probed = img.size
+                        width, height = probed
+                        # Format as greatest_dimension x smallest_dimension
+                        if width >= height:
+                            dimensions = f"{width}x{height}"
+                        else:
+                            dimensions = f"{height}x{width}"
+                        if dim_cache is not None:
+                            dim_cache.execute(
+                                "INSERT OR REPLACE INTO dims VALUES (?, ?, ?, ?)",
+                                (file_path, file_size, mtime, dimensions))
+                    dimensions_counter[dimensions] += 1
+                    all_dimensions[dimensions] += 1
+                    images_processed += 1
+                except Exception:
+                    # Skip files that can't be opened as images
+                    pass
         
         # Calculate average file size
         avg_size = table_size / file_count if file_count > 0 else 0
@@ -145,6 +309,11 @@ def get_sizes(test_all=False):
         grand_total_size += table_size
         grand_total_files += file_count
     
+    # One commit covers every probe recorded this run
+    if dim_cache is not None:
+        dim_cache.commit()
+        dim_cache.close()
+    
     # Add spacing between columns
     col_spacing = 4
     total_width = (max_table_name_len + max_files_len + max_total_size_len + 
@@ -171,32 +340,28 @@ def get_sizes(test_all=False):
     
     # Now print the header with adjusted column widths
     mode_text = " (testing all images)" if test_all else ""
-    print(f"\nAttachment Size Summary{mode_text}:")
-    
     header = (f"{'Table':<{max_table_name_len}}" + " " * col_spacing +
               f"{'Files':<{max_files_len}}" + " " * col_spacing +
               f"{'Total Size':<{max_total_size_len}}" + " " * col_spacing +
               f"{'Avg Size':<{max_avg_size_len}}" + " " * col_spacing +
               f"{'Dimensions':<{max_dimensions_len}}")
-    print(header)
-    print("-" * total_width)
-    
-    # Print each row with adjusted column widths
-    for row in table_data:
-        print(f"{row['table']:<{max_table_name_len}}" + " " * col_spacing +
-              f"{row['file_count']:<{max_files_len}}" + " " * col_spacing +
-              f"{row['total_size']:<{max_total_size_len}}" + " " * col_spacing +
-              f"{row['avg_size']:<{max_avg_size_len}}" + " " * col_spacing +
-              f"{row['dimensions']:<{max_dimensions_len}}")
-    
-    # Print the separator and totals row
-    print("-" * total_width)
-    print(f"{'TOTAL':<{max_table_name_len}}" + " " * col_spacing +
-          f"{grand_total_files:<{max_files_len}}" + " " * col_spacing +
-          f"{formatted_grand_total_size:<{max_total_size_len}}" + " " * col_spacing +
-          f"{formatted_grand_avg_size:<{max_avg_size_len}}" + " " * col_spacing +
-          f"{most_common_overall:<{max_dimensions_len}}")
-    print()
+    
+    # Emit the whole report - title, header, body and totals - as one
+    # buffered write instead of a print per row
+    rows = [f"\nAttachment Size Summary{mode_text}:", header, "-" * total_width]
+    rows += [f"{row['table']:<{max_table_name_len}}" + " " * col_spacing +
+            f"{row['file_count']:<{max_files_len}}" + " " * col_spacing +
+            f"{row['total_size']:<{max_total_size_len}}" + " " * col_spacing +
+            f"{row['avg_size']:<{max_avg_size_len}}" + " " * col_spacing +
+            f"{row['dimensions']:<{max_dimensions_len}}"
+             for row in table_data]
+    rows.append("-" * total_width)
+    rows.append(f"{'TOTAL':<{max_table_name_len}}" + " " * col_spacing +
+                f"{grand_total_files:<{max_files_len}}" + " " * col_spacing +
+                f"{formatted_grand_total_size:<{max_total_size_len}}" + " " * col_spacing +
+                f"{formatted_grand_avg_size:<{max_avg_size_len}}" + " " * col_spacing +
+                f"{most_common_overall:<{max_dimensions_len}}")
+    sys.stdout.write("\n".join(rows) + "\n\n")
 
 def get_detailed_sizes():
     """Print a detailed summary of file types and their sizes under data/attachments."""
@@ -206,54 +371,199 @@ def get_detailed_sizes():
         print(f"Error: Attachments directory {attachments_dir} does not exist")
         sys.exit(1)
     
-    # Track sizes by file extension
-    extension_sizes = defaultdict(lambda: {'count': 0, 'total_size': 0})
+    # Track counts and byte totals per extension in two Counters; their
+    # C-implemented updates beat per-file dict-of-dict writes
+    counts = Counter()
+    sizes = Counter()
     
-    # Walk through all subdirectories
-    for root, _, files in os.walk(attachments_dir):
-        for file in files:
-            file_path = os.path.join(root, file)
-            file_size = get_file_size(file_path)
-            
-            # Get file extension (lowercase)
-            _, ext = os.path.splitext(file)
-            ext = ext.lower() if ext else 'no_extension'
-            
-            # Update statistics
-            extension_sizes[ext]['count'] += 1
-            extension_sizes[ext]['total_size'] += file_size
-    
-    # Print summary by file type
-    print(f"\nFile Type Summary:")
-    print(f"{'Extension':<15} {'Files':<10} {'Total Size':<15} {'Avg Size':<15}")
-    print("-" * 60)
-    
-    # Sort by total size (descending)
-    sorted_extensions = sorted(
-        extension_sizes.items(),
-        key=lambda x: x[1]['total_size'],
-        reverse=True
-    )
+    # One threaded scan gathers every file's path and size
+    for file_path, file_size in _scan_files(attachments_dir):
+        # Get file extension (lowercase)
+        _, ext = os.path.splitext(file_path)
+        ext = ext.lower() if ext else 'no_extension'
+        
+        counts[ext] += 1
+        sizes[ext] += file_size
     
     grand_total_size = 0
     grand_total_files = 0
     
-    for ext, stats in sorted_extensions:
-        count = stats['count']
-        total_size = stats['total_size']
+    # Buffer the whole report (extensions ordered largest total first)
+    # and flush it in one write
+    rows = ["\nFile Type Summary:",
+            f"{'Extension':<15} {'Files':<10} {'Total Size':<15} {'Avg Size':<15}",
+            "-" * 60]
+    for ext, total_size in sizes.most_common():
+        count = counts[ext]
         avg_size = total_size / count if count > 0 else 0
         
-        print(f"{ext:<15} {count:<10} {format_size(total_size):<15} {format_size(avg_size):<15}")
+        rows.append(f"{ext:<15} {count:<10} {format_size(total_size):<15} {format_size(avg_size):<15}")
         
         grand_total_size += total_size
         grand_total_files += count
     
-    print("-" * 60)
+    rows.append("-" * 60)
     grand_avg_size = grand_total_size / grand_total_files if grand_total_files > 0 else 0
-    print(f"{'TOTAL':<15} {grand_total_files:<10} {format_size(grand_total_size):<15} {format_size(grand_avg_size):<15}")
-    print()
+    rows.append(f"{'TOTAL':<15} {grand_total_files:<10} {format_size(grand_total_size):<15} {format_size(grand_avg_size):<15}")
+    sys.stdout.write("\n".join(rows) + "\n\n")
+
+def _copytree_parallel(src: str, dst: str, workers: int = 8) -> None:
+    """Copy a tree byte-for-byte with the file copies fanned out over threads.
+
+    Fallback for filesystems without hardlink support: the directory
+    skeleton is created up front, then the per-file copies (which use the
+    kernel's zero-copy path via shutil on Linux) overlap across threads.
+    """
+    jobs = []
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, target))
+                elif entry.is_file(follow_symlinks=False):
+                    jobs.append((entry.path, target))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Drain the iterator so copy errors surface here
+        list(executor.map(lambda job: shutil.copy2(*job), jobs))
+
+def _resize_one_vips(file_path: str, file_original_size: int, ext: str,
+                     max_dimension: int, quality: int, postfix: dict):
+    """Resize one JPEG through libvips' streaming pipeline.
+
+    pyvips.Image.thumbnail combines shrink-on-load (the same DCT-domain
+    trick as draft(), taken further), the final resample and the encode
+    into one tile-streamed pass, so the full-resolution bitmap never
+    materializes in memory. It also bakes the EXIF orientation into the
+    pixels and resets the tag; strip=False keeps the rest of the EXIF.
 
-def resize_images(max_dimension: int = 1024, quality: int = 85, backup: bool = True, table: str = None):
+    Returns the usual (original_size, new_size, status, postfix) tuple,
+    or None to send the file down the Pillow path instead.
+    """
+    probed = _fast_image_size(file_path, ext)
+    if probed is None:
+        # Can't cheaply tell whether a resize is needed; let the Pillow
+        # path make the call from the decoded header
+        return None
+    width, height = probed
+    if width <= max_dimension and height <= max_dimension:
+        return file_original_size, file_original_size, 'skipped', postfix
+    try:
+        image = pyvips.Image.thumbnail(file_path, max_dimension,
+                                       height=max_dimension, size='down')
+        tmp_path = f"{file_path}.resize-tmp{ext}"
+        image.jpegsave(tmp_path, Q=quality, optimize_coding=True, strip=False)
+        file_new_size = os.path.getsize(tmp_path)
+        # Same swap as the Pillow path: replace rather than rewrite, so a
+        # hardlinked backup keeps the original bytes
+        os.replace(tmp_path, file_path)
+        return file_original_size, file_new_size, 'resized', postfix
+    except Exception:
+        return None
+
+def _resize_one(task: Tuple[str, int, str], max_dimension: int, quality: int):
+    """Resize a single image file in place.
+
+    Module-level so ProcessPoolExecutor can pickle it into worker
+    processes; the LANCZOS resample and JPEG re-encode are CPU-bound and
+    fully independent per file.
+
+    Args:
+        task: (file_path, original_size, table) as collected by the scan
+        max_dimension: Maximum width or height in pixels
+        quality: JPEG quality (0-100)
+
+    Returns:
+        Tuple of (original_size, resulting_size, status, postfix) where
+        status is 'resized', 'skipped' or 'error' and postfix carries the
+        progress-bar annotations.
+    """
+    file_path, file_original_size, table = task
+    file = os.path.basename(file_path)
+    ext = os.path.splitext(file)[1].lower()
+    is_jpeg = ext in _JPEG_EXTS
+    postfix = {"file": f"{table}/{file}"}
+    if PYVIPS_AVAILABLE and is_jpeg:
+        result = _resize_one_vips(file_path, file_original_size, ext,
+                                  max_dimension, quality, postfix)
+        if result is not None:
+            return result
+    try:
+        with Image.open(file_path) as img:
+            # The header alone answers whether any work is needed; for
+            # already-small images this skips EXIF parsing and never
+            # decodes a pixel
+            width, height = img.size
+            if width <= max_dimension and height <= max_dimension:
+                return file_original_size, file_original_size, 'skipped', postfix
+            if is_jpeg:
+                # Let libjpeg downscale in the DCT domain during decode;
+                # asking for twice the target size leaves the LANCZOS pass
+                # enough detail while cutting decode time and the size of
+                # the intermediate RGB buffer on phone-camera originals
+                img.draft('RGB', (max_dimension * 2, max_dimension * 2))
+            exif = img.info.get('exif') if 'exif' in img.info else None
+            try:
+                if is_jpeg and exif:
+                    orientation_value = img.getexif().get(_ORIENTATION_TAG)
+                    if orientation_value and orientation_value != 1:
+                        postfix["exif"] = f"EXIF {orientation_value}"
+                        if PIEXIF_AVAILABLE:
+                            # Bake the rotation into the pixels with one
+                            # library call and reset the tag in the blob we
+                            # re-save, so viewers don't rotate a second time
+                            img = ImageOps.exif_transpose(img)
+                            exif_dict = piexif.load(exif)
+                            exif_dict['0th'][piexif.ImageIFD.Orientation] = 1
+                            exif = piexif.dump(exif_dict)
+            except Exception as e:
+                postfix["warn"] = f"EXIF warn"
+            # thumbnail() does the aspect-ratio math internally and
+            # resizes in place rather than allocating a second image
+            img.thumbnail((max_dimension, max_dimension), _LANCZOS)
+            save_kwargs = {'quality': quality, 'optimize': True}
+            if is_jpeg and exif:
+                save_kwargs['exif'] = exif
+            # Encode into memory first: the buffer length gives the new
+            # size without a stat call and the file write is one syscall.
+            # The bytes then go to a sibling temp file swapped into place,
+            # so the original inode - hardlinked into the backup - is
+            # unlinked rather than truncated and rewritten.
+            img_format = img.format or ('JPEG' if is_jpeg else 'PNG')
+            buf = io.BytesIO()
+            saved = False
+            try:
+                img.save(buf, format=img_format, **save_kwargs)
+                saved = True
+            except Exception as e:
+                postfix["warn"] = "Save warn"
+                try:
+                    save_kwargs.pop('exif', None)
+                    buf = io.BytesIO()
+                    img.save(buf, format=img_format, **save_kwargs)
+                    saved = True
+                except Exception as e2:
+                    postfix["error"] = "Save fail"
+            if saved:
+                tmp_path = f"{file_path}.resize-tmp{ext}"
+                with open(tmp_path, 'wb') as f:
+                    f.write(buf.getbuffer())
+                os.replace(tmp_path, file_path)
+                file_new_size = len(buf.getbuffer())
+            else:
+                file_new_size = file_original_size
+            reduction = (1 - (file_new_size / file_original_size)) * 100
+            postfix["reduction"] = f"{reduction:.1f}%"
+            return file_original_size, file_new_size, 'resized', postfix
+    except Exception as e:
+        postfix["error"] = "Proc fail"
+        return file_original_size, file_original_size, 'error', postfix
+
+def resize_images(max_dimension: int = 1024, quality: int = 85, backup: bool = True, table: str = None,
+                  min_size_bytes: int = 0):
     """Resize all images in the attachments directory to reduce file size.
     
     Args:
@@ -261,6 +571,9 @@ def resize_images(max_dimension: int = 1024, quality: int = 85, backup: bool = T
         quality: JPEG quality (0-100, higher is better quality but larger file)
         backup: If True, create a backup of original images before resizing
         table: If provided, only resize images for the specified table
+        min_size_bytes: Files smaller than this are skipped without even
+            opening them; useful when a corpus has a long tail of
+            thumbnails that cannot meaningfully shrink (0 disables)
     """
     attachments_dir = os.path.join('data', 'attachments')
     
@@ -299,85 +612,71 @@ def resize_images(max_dimension: int = 1024, quality: int = 85, backup: bool = T
     original_size = 0
     new_size = 0
     
-    # First, collect all image files to process
+    # Back up the tables first, several at a time; each copy is I/O-bound
+    # so the work overlaps well across a few threads
+    if backup:
+        def backup_one(table):
+            table_dir = os.path.join(attachments_dir, table)
+            backup_table_dir = os.path.join('data', 'attachments_backup', table)
+            if os.path.exists(backup_table_dir):
+                return None
+            # Hardlinks make the backup a metadata-only operation
+            # instead of re-copying every byte; resized files are
+            # written to a new inode and swapped in, so the linked
+            # originals stay intact. Fall back to a byte copy on
+            # filesystems without hardlink support.
+            try:
+                shutil.copytree(table_dir, backup_table_dir, copy_function=os.link)
+            except OSError:
+                shutil.rmtree(backup_table_dir, ignore_errors=True)
+                _copytree_parallel(table_dir, backup_table_dir)
+            return backup_table_dir
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for table_name, backup_table_dir in zip(tables, executor.map(backup_one, tables)):
+                if backup_table_dir:
+                    print(f"Backed up {table_name} to {backup_table_dir}")
+
+    # First, collect all image files to process. Files under the size
+    # threshold count as skipped without ever being opened.
     image_files = []
     for table in tables:
         table_dir = os.path.join(attachments_dir, table)
-        # Backup table directory if needed
-        if backup:
-            backup_table_dir = os.path.join('data', 'attachments_backup', table)
-            if not os.path.exists(backup_table_dir):
-                shutil.copytree(table_dir, backup_table_dir)
-                print(f"Backed up {table} to {backup_table_dir}")
-        for root, _, files in os.walk(table_dir):
-            for file in files:
-                _, ext = os.path.splitext(file)
-                if ext.lower() in ['.jpg', '.jpeg', '.png']:
-                    image_files.append((root, file, table))
-    total_files = len(image_files)
+        # The scan already carries each file's size from the directory
+        # read, so no per-file getsize call is needed later
+        for file_path, file_size in _scan_files(table_dir, use_cache=False):
+            if os.path.splitext(file_path)[1].lower() in _RESIZE_EXTS:
+                if min_size_bytes and file_size < min_size_bytes:
+                    skipped_files += 1
+                    original_size += file_size
+                    new_size += file_size
+                    continue
+                image_files.append((file_path, file_size, table))
+    total_files = len(image_files) + skipped_files
     if total_files == 0:
         print("No image files found to process.")
         return
     
-    with tqdm(image_files, total=total_files, desc="Resizing images", ncols=100,
+    # The resample/encode work is CPU-bound and per-file independent, so
+    # it fans out across worker processes; chunksize amortizes the IPC
+    # cost of shipping tasks and results. Printing stays in this process.
+    worker = partial(_resize_one, max_dimension=max_dimension, quality=quality)
+    with tqdm(total=len(image_files), desc="Resizing images", ncols=100,
+             mininterval=0.2, miniters=16,
              bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]') as bar:
-        for root, file, table in bar:
-            file_path = os.path.join(root, file)
-            file_original_size = get_file_size(file_path)
-            original_size += file_original_size
-            postfix = {"file": f"{table}/{file}"}
-            try:
-                with Image.open(file_path) as img:
-                    exif = img.info.get('exif') if 'exif' in img.info else None
-                    try:
-                        _, ext = os.path.splitext(file)
-                        if ext.lower() in ['.jpg', '.jpeg'] and exif:
-                            from PIL import ExifTags
-                            for orientation in ExifTags.TAGS.keys():
-                                if ExifTags.TAGS[orientation] == 'Orientation':
-                                    break
-                            exif_data = img._getexif()
-                            if exif_data and orientation in exif_data:
-                                orientation_value = exif_data[orientation]
-                                postfix["exif"] = f"EXIF {orientation_value}"
-                    except Exception as e:
-                        postfix["warn"] = f"EXIF warn"
-                    width, height = img.size
-                    if width > max_dimension or height > max_dimension:
-                        if width > height:
-                            new_height = int(height * (max_dimension / width))
-                            new_width = max_dimension
-                        else:
-                            new_width = int(width * (max_dimension / height))
-                            new_height = max_dimension
-                        resized_img = img.resize((new_width, new_height), Image.LANCZOS)
-                        if ext.lower() in ['.jpg', '.jpeg']:
-                            try:
-                                if exif:
-                                    resized_img.save(file_path, quality=quality, optimize=True, exif=exif)
-                                else:
-                                    resized_img.save(file_path, quality=quality, optimize=True)
-                            except Exception as e:
-                                postfix["warn"] = "Save warn"
-                                try:
-                                    resized_img.save(file_path, quality=quality, optimize=True)
-                                except Exception as e2:
-                                    postfix["error"] = "Save fail"
-                        else:
-                            resized_img.save(file_path, quality=quality, optimize=True)
-                        file_new_size = get_file_size(file_path)
-                        new_size += file_new_size
-                        reduction = (1 - (file_new_size / file_original_size)) * 100
-                        postfix["reduction"] = f"{reduction:.1f}%"
-                        processed_files += 1
-                    else:
-                        new_size += file_original_size
-                        skipped_files += 1
-            except Exception as e:
-                postfix["error"] = "Proc fail"
-                error_files += 1
-                new_size += file_original_size
-            bar.set_postfix(postfix, refresh=True)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for file_original_size, file_new_size, status, postfix in executor.map(
+                    worker, image_files, chunksize=16):
+                original_size += file_original_size
+                new_size += file_new_size
+                if status == 'resized':
+                    processed_files += 1
+                elif status == 'skipped':
+                    skipped_files += 1
+                else:
+                    error_files += 1
+                bar.set_postfix(postfix, refresh=False)
+                bar.update(1)
     # Print summary
     print("\n" + "="*60)
     print("Resize Summary:")
@@ -450,6 +749,8 @@ def main():
                             help='Skip creating backup of original images')
         parser.add_argument('--table', type=str,
                             help='Only process images for the specified table')
+        parser.add_argument('--min-size-bytes', type=int, default=0,
+                            help='Skip files smaller than this many bytes without opening them (default: 0 = off)')
     
     # Arguments for get_sizes
     parser.add_argument('--testall', action='store_true',
@@ -467,7 +768,8 @@ def main():
                 max_dimension=args.max_dimension,
                 quality=args.quality,
                 backup=not args.no_backup,
-                table=args.table
+                table=args.table,
+                min_size_bytes=args.min_size_bytes
             )
         else:
             print("Error: PIL library is not available. Please install it to use the resize_images command.")
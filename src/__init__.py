@@ -6,6 +6,6 @@ supporting pseudotype conversions and attachment management.
 """
 
 from .migrator import DatabaseMigrator
-from .models import DatabaseConfig
+from .models import DatabaseConfig, Transform
 
-__all__ = ['DatabaseMigrator', 'DatabaseConfig']
\ No newline at end of file
+__all__ = ['DatabaseMigrator', 'DatabaseConfig', 'Transform']
\ No newline at end of file
@@ -2,11 +2,12 @@ from sqlite3 import connect
 from typing import List, Dict, Any, Set, Tuple, Callable, Type, Optional
 from datetime import datetime, date
 import logging
+import threading
 import json  # Add json import for array/string conversions
 from src.utils import progress_bar_iter
 from tqdm import tqdm
 
-from src.models import DatabaseConfig
+from src.models import DatabaseConfig, Transform
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,11 +15,31 @@ logger = logging.getLogger(__name__)
 class DatabaseMigrator:
     def __init__(self, config: DatabaseConfig):
         self.config = config
-        self.source_db = connect(config.source_db_path)
-        self.target_db = connect(config.target_db_path)
+        # Migration re-executes the same statement shapes (per-table SELECTs
+        # and INSERTs) many times; a larger per-connection statement cache
+        # keeps them prepared instead of re-parsing on each reuse.
+        # check_same_thread=False lets migrate_table run from worker
+        # threads; SQLite still allows only one writer, so target write
+        # transactions are serialized behind _write_lock while source
+        # reads and Python-side row transformation overlap across threads.
+        self.source_db = connect(config.source_db_path, cached_statements=512,
+                                 check_same_thread=False)
+        self.target_db = connect(config.target_db_path, cached_statements=512,
+                                 check_same_thread=False)
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        # Attach the source database to the target connection once, so
+        # tables that need no Python-side transformation can be copied
+        # with a single INSERT ... SELECT inside SQLite
+        try:
+            self.target_db.execute("ATTACH DATABASE ? AS src", (config.source_db_path,))
+        except Exception as e:
+            logger.warning(f"Could not attach source database for fast copy: {str(e)}")
         # Flag to control verbose output
         self.verbose_mode = True
         self.migration_stats = {
+            "test_mode": config.test_mode,
+            "max_rows_per_table": config.max_rows_per_table,
             "tables_migrated": 0,
             "tables_skipped": 0,
             "total_records_migrated": 0,
@@ -33,6 +54,20 @@ class DatabaseMigrator:
             "before": {},
             "after": {}
         }
+        # Per-table transformation plans, compiled on first use
+        self._compiled_plans = {}
+        # (table, column) pairs already warned about unusable transforms
+        self._warned_skipped_transforms = set()
+        # Load configured lookup tables into dicts up front so transformations
+        # can resolve values without per-row queries
+        self.preloaded_tables = {}
+        for table, (key_col, value_col) in config.preloaded_tables.items():
+            cursor = self.source_db.cursor()
+            try:
+                cursor.execute(f"SELECT {key_col}, {value_col} FROM {table}")
+                self.preloaded_tables[table] = dict(cursor.fetchall())
+            except Exception as e:
+                logger.warning(f"Error preloading table {table}: {str(e)}")
     
     def get_table_names(self, db) -> Set[str]:
         """Get all table names from a database, excluding those starting with '_' or 'L__'."""
@@ -145,7 +180,7 @@ class DatabaseMigrator:
             if "unsupported_conversions" not in self.migration_stats:
                 self.migration_stats["unsupported_conversions"] = {}
             
-            table_name = getattr(self, "_current_table", "unknown_table")
+            table_name = getattr(self._local, "current_table", "unknown_table")
             if table_name not in self.migration_stats["unsupported_conversions"]:
                 self.migration_stats["unsupported_conversions"][table_name] = {}
             
@@ -159,6 +194,110 @@ class DatabaseMigrator:
         # Default: return the original value
         return value
     
+    def _transformation_plan(self, table_name: str, matching_columns: Set[str]) -> List[Tuple[str, Callable, bool]]:
+        """Build the (column, callable, is_batch) plan for a table.
+
+        The plan is compiled once per (table, column set) and cached, so
+        the row loop iterates a fixed sequence instead of re-filtering
+        column_transformations and re-checking the batch flag per batch.
+        The column set is part of the cache key because a source query
+        override can surface a different set than the table schema.
+        """
+        key = (table_name, frozenset(matching_columns))
+        plan = self._compiled_plans.get(key)
+        if plan is None:
+            plan = [(col, t.fn, t.batch)
+                    for col, t in self.config.column_transformations.items()
+                    if col in matching_columns and isinstance(t, Transform)]
+            self._compiled_plans[key] = plan
+            # A transformation configured for a column the source rows
+            # don't carry silently never runs (and the table may even
+            # fast-copy), leaving the target column NULL. When the target
+            # table has the column, say so once: the fix is a
+            # source_query_override that joins the value in.
+            skipped = [col for col, t in self.config.column_transformations.items()
+                       if isinstance(t, Transform) and col not in matching_columns]
+            if skipped:
+                target_columns = self.get_column_names(self.target_db, table_name)
+                for col in skipped:
+                    if col in target_columns and (table_name, col) not in self._warned_skipped_transforms:
+                        self._warned_skipped_transforms.add((table_name, col))
+                        logger.warning(
+                            f"Transformation for column '{col}' will not run for "
+                            f"table {table_name}: the source rows don't include "
+                            f"'{col}'. Add a source_query_override for "
+                            f"{table_name} that supplies it, or the column will "
+                            f"be left NULL.")
+        return plan
+
+    def _migrate_table_fastpath(self, table_name: str) -> Optional[int]:
+        """Copy a table entirely inside SQLite when no transformation applies.
+
+        When a table has no configured source query override, no column
+        transformations and identical pseudotypes on the matching columns,
+        the rows never need to pass through Python: one
+        INSERT INTO main.<t> (...) SELECT ... FROM src.<t> streams them
+        through SQLite's page cache instead of the per-row copy loop.
+
+        Returns:
+            The number of rows copied, or None when the table needs the
+            regular Python migration path.
+        """
+        if table_name in self.config.source_query_overrides:
+            return None
+
+        source_columns = self.get_column_names(self.source_db, table_name)
+        target_columns = self.get_column_names(self.target_db, table_name)
+        matching_columns = sorted(source_columns & target_columns)
+        if not matching_columns:
+            return None
+
+        # Any configured transformation or pseudotype change forces the
+        # Python path for this table
+        if self._transformation_plan(table_name, set(matching_columns)):
+            return None
+        source_pseudotypes = self.get_column_pseudotype(self.source_db, table_name)
+        target_pseudotypes = self.get_column_pseudotype(self.target_db, table_name)
+        if any(source_pseudotypes.get(col, "string") != target_pseudotypes.get(col, "string")
+               for col in matching_columns):
+            return None
+
+        columns_sql = ', '.join(matching_columns)
+        copy_sql = (f"INSERT INTO main.{table_name} ({columns_sql}) "
+                    f"SELECT {columns_sql} FROM src.{table_name}")
+        params = ()
+        if self.config.test_mode and self.config.max_rows_per_table is not None:
+            copy_sql += " LIMIT ?"
+            params = (self.config.max_rows_per_table,)
+
+        try:
+            with self._write_lock:
+                cursor = self.target_db.cursor()
+                try:
+                    cursor.execute("BEGIN TRANSACTION")
+                    cursor.execute(copy_sql, params)
+                    self.target_db.commit()
+                except Exception:
+                    # Roll back while still holding the lock, so the shared
+                    # connection is clean before another table's BEGIN runs
+                    try:
+                        self.target_db.rollback()
+                    except Exception:
+                        pass
+                    raise
+                inserted = cursor.rowcount
+        except Exception as e:
+            # Constraint or schema surprises fall back to the row-by-row
+            # path, which reports per-batch errors in detail
+            logger.warning(f"Fast copy failed for table {table_name}, "
+                           f"falling back to row migration: {str(e)}")
+            return None
+
+        with self._write_lock:
+            self.migration_stats["total_records_migrated"] += inserted
+        logger.info(f"Fast-copied {inserted} records into {table_name}")
+        return inserted
+
     def migrate_table(self, table_name: str):
         """Migrate a single table, handling column matching and transformations."""
         # Get the root logger to control all logging
@@ -169,7 +308,8 @@ class DatabaseMigrator:
             src_logger.info(f"\nProcessing table: {table_name}")
         
         # Store current table name for reference in other methods
-        self._current_table = table_name
+        # (thread-local so parallel table migrations don't clobber it)
+        self._local.current_table = table_name
         
         # Check if source table has any rows
         cursor = self.source_db.cursor()
@@ -178,11 +318,31 @@ class DatabaseMigrator:
         if source_count == 0:
             if root_logger.level <= logging.INFO:
                 src_logger.info(f"Skipping table {table_name} - no records in source")
-            self.migration_stats["tables_skipped"] += 1
-            return
-        
+            with self._write_lock:
+                self.migration_stats["tables_skipped"] += 1
+            return 0
+
+        # Tables needing no transformation are copied inside SQLite
+        fast_count = self._migrate_table_fastpath(table_name)
+        if fast_count is not None:
+            return fast_count
+
+        # Fetch source records, honouring any configured source query override.
+        # Overrides can join in extra columns (e.g. hh.village) so they arrive
+        # pre-populated without a per-row Python callback.
+        source_query = self.config.source_query_overrides.get(
+            table_name, f"SELECT * FROM {table_name}")
+        if self.config.test_mode and self.config.max_rows_per_table is not None:
+            # Push the row limit into SQL so the tail is never fetched
+            cursor.execute(f"SELECT * FROM ({source_query}) LIMIT ?",
+                           (self.config.max_rows_per_table,))
+        else:
+            cursor.execute(source_query)
+        source_records = cursor.fetchall()
+        column_names = [description[0] for description in cursor.description]
+
         # Get column names from both databases
-        source_columns = self.get_column_names(self.source_db, table_name)
+        source_columns = set(column_names)
         target_columns = self.get_column_names(self.target_db, table_name)
         
         # Get pseudotype information for source and target columns
@@ -207,20 +367,14 @@ class DatabaseMigrator:
         
         if not matching_columns:
             logger.warning(f"No matching columns found for table {table_name}")
-            self.migration_stats["tables_skipped"] += 1
-            return
+            with self._write_lock:
+                self.migration_stats["tables_skipped"] += 1
+            return 0
         
         try:
-            # Fetch records from source with limit if in test mode
-            limit_clause = f""
-            cursor.execute(f"SELECT * FROM {table_name} {limit_clause}")
-            source_records = cursor.fetchall()
-            
-            # Get column names in the correct order
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            column_info = cursor.fetchall()
-            column_names = [col[1] for col in column_info]
-            
+            # Custom transformations that apply to this table's columns
+            plan = self._transformation_plan(table_name, matching_columns)
+
             # Transform and insert records
             if source_records:
                 logger.info(f"Attempting to insert {len(source_records)} records into {table_name}")
@@ -228,47 +382,93 @@ class DatabaseMigrator:
                     # Log first record for debugging
                     logger.info(f"Sample record: {dict(zip(column_names, source_records[0]))}")
                     
-                    # Insert records in batches of 100 to avoid SQLite variable limit
-                    batch_size = 100  # Reduced from 500 to stay under SQLite's variable limit
+                    # Insert records in batches; executemany binds one row at a
+                    # time, so batch size is no longer capped by SQLite's
+                    # variable limit and only bounds memory per batch
+                    batch_size = 1000
                     num_batches = (len(source_records) + batch_size - 1) // batch_size
-                    
+                    ordered_columns = sorted(matching_columns)
+                    insert_sql = (f"INSERT INTO {table_name} ({', '.join(ordered_columns)}) "
+                                  f"VALUES ({', '.join('?' for _ in ordered_columns)})")
+
+                    # Work on rows by position instead of building a dict per
+                    # row: resolve every column name to its index once, then
+                    # the per-row loops are plain list indexing
+                    col_idx = {name: i for i, name in enumerate(column_names)}
+                    matching_idx = [col_idx[col] for col in ordered_columns]
+
+                    # Classify the columns whose pseudotype differs once up
+                    # front; the per-row loop then touches only those columns
+                    # instead of re-reading both pseudotype dicts per column
+                    # per record
+                    converting_columns = [
+                        (col_idx[col], col,
+                         source_pseudotypes.get(col, "string"),
+                         target_pseudotypes.get(col, "string"))
+                        for col in matching_columns
+                        if source_pseudotypes.get(col, "string") != target_pseudotypes.get(col, "string")
+                    ]
+
+                    # Split the transformation plan: scalar callables work on
+                    # positional values, batch-mode callables keep their
+                    # documented dict-records contract
+                    plan_scalar = [(col_idx[col], fn) for col, fn, is_batch in plan if not is_batch]
+                    plan_batch = [(col_idx[col], fn) for col, fn, is_batch in plan if is_batch]
+
+                    def transformed_rows(rows):
+                        # Yield converted row tuples lazily so whole-batch
+                        # value lists are never materialized
+                        for row in rows:
+                            for idx, col, source_type, target_type in converting_columns:
+                                row[idx] = self.convert_value_by_pseudotype(
+                                    row[idx], source_type, target_type, col
+                                )
+                            yield tuple(row[i] for i in matching_idx)
+
                     total_inserted = 0
                     total_errors = 0
-                    
+
                     # Process each batch without individual progress bars
                     for i in range(0, len(source_records), batch_size):
-                        batch = source_records[i:i + batch_size]
-                        placeholders = ", ".join(["(" + ", ".join(["?" for _ in matching_columns]) + ")" for _ in batch])
-                        insert_sql = f"INSERT INTO {table_name} ({', '.join(matching_columns)}) VALUES {placeholders}"
-                        values = []
-                        for record in batch:
-                            record_dict = dict(zip(column_names, record))
-                            for col in matching_columns:
-                                source_type = source_pseudotypes.get(col, "string")
-                                target_type = target_pseudotypes.get(col, "string")
-                                if source_type != target_type:
-                                    original_value = record_dict[col]
-                                    converted_value = self.convert_value_by_pseudotype(
-                                        original_value, source_type, target_type, col
-                                    )
-                                    record_dict[col] = converted_value
-                            values.extend([record_dict[col] for col in matching_columns])
+                        batch = [list(record) for record in source_records[i:i + batch_size]]
+
+                        # Apply custom column transformations; batch-mode callables
+                        # (marked with fn._batch) run once per batch instead of per record
+                        for idx, transform in plan_scalar:
+                            for row in batch:
+                                row[idx] = transform(row[idx])
+                        if plan_batch:
+                            record_dicts = [dict(zip(column_names, row)) for row in batch]
+                            for idx, transform in plan_batch:
+                                transformed = transform(self.source_db, record_dicts)
+                                for row, value in zip(batch, transformed):
+                                    row[idx] = value
+
                         try:
-                            # Use connection's execute method for proper transaction handling
-                            target_cursor = self.target_db.cursor()
-                            target_cursor.execute("BEGIN TRANSACTION")
-                            target_cursor.execute(insert_sql, values)
-                            self.target_db.commit()
+                            # Use connection's execute method for proper transaction handling.
+                            # The lock keeps each batch's BEGIN/COMMIT pair
+                            # atomic on the shared target connection when
+                            # tables migrate in parallel.
+                            with self._write_lock:
+                                target_cursor = self.target_db.cursor()
+                                try:
+                                    target_cursor.execute("BEGIN TRANSACTION")
+                                    target_cursor.executemany(insert_sql, transformed_rows(batch))
+                                    self.target_db.commit()
+                                except Exception:
+                                    # Roll back before the lock frees: a
+                                    # dangling transaction on the shared
+                                    # connection would make the next
+                                    # thread's BEGIN fail
+                                    try:
+                                        self.target_db.rollback()
+                                    except Exception as rollback_error:
+                                        logger.error(f"Rollback error: {str(rollback_error)}")
+                                    raise
                             total_inserted += len(batch)
                             # Log batch progress in a simple format without progress bar
                             logger.debug(f"Batch {i//batch_size + 1}/{num_batches}: Inserted {len(batch)} records")
                         except Exception as e:
-                            # Properly handle rollback
-                            try:
-                                self.target_db.rollback()
-                            except Exception as rollback_error:
-                                logger.error(f"Rollback error: {str(rollback_error)}")
-                            
                             total_errors += len(batch)
                             logger.error(f"Error inserting batch {i//batch_size + 1}/{num_batches}: {str(e)}")
                     
@@ -281,16 +481,24 @@ class DatabaseMigrator:
                             for example in info["examples"]:
                                 logger.info(f"    Example: {example['original']} -> {example['converted']}")
                     
-                    self.migration_stats["total_records_migrated"] += total_inserted
+                    with self._write_lock:
+                        self.migration_stats["total_records_migrated"] += total_inserted
                     logger.info(f"Successfully migrated {total_inserted} records with {total_errors} errors")
                 except Exception as e:
                     logger.error(f"Error during migration for table {table_name}: {str(e)}")
                     raise
             else:
                 logger.warning(f"No records to migrate for table {table_name}")
-            
+            return total_inserted if source_records else 0
+
         except Exception as e:
-            self.target_db.rollback()
+            # Re-acquire the lock for the rollback so it can't abort a
+            # transaction another table's thread has in flight
+            with self._write_lock:
+                try:
+                    self.target_db.rollback()
+                except Exception:
+                    pass
             logger.error(f"Error migrating table {table_name}: {str(e)}")
             raise
     
@@ -1,14 +1,84 @@
-from typing import Dict, List, Optional, Callable, Union, Type, Any
-from pydantic import BaseModel
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Callable, Tuple, Union, Type, Any
+from pydantic import BaseModel, validator
 from sqlalchemy import Integer, String, Float, Boolean, DateTime, Date
 
+from src.transformers import (capitalize_string, coerce_to_bool,
+                              coerce_to_float, coerce_to_int, extract_date)
+
+# String shortcuts accepted in column_transformations, resolved to real
+# callables once when the config loads rather than per row
+_NAMED_TRANSFORMS = {
+    "to_int": coerce_to_int,
+    "to_float": coerce_to_float,
+    "to_bool": coerce_to_bool,
+    "title": capitalize_string,
+    "extract_date": extract_date,
+}
+
+@dataclass
+class Transform:
+    """A column transformation resolved to a plain callable.
+
+    Every column_transformations entry is normalized to this shape at
+    config-load time, so the migrator's plan compiler reads fn/batch
+    directly instead of re-inspecting entries while migrating. No
+    slots=True here: pydantic v1's dataclass field validation reads
+    __dict__, so a slotted Transform crashes config loading.
+    """
+    fn: Callable
+    batch: bool = False
+
 class DatabaseConfig(BaseModel):
     """Core configuration class for the ODK-X database migration tool.
     
     This class defines the structure for configuring database migrations
-    between ODK-X databases with different schemas.
+    between ODK-X databases with different schemas. Instances are frozen:
+    the migrator caches structures derived from the config (e.g. compiled
+    transformation plans), which is only safe if the config cannot change
+    underneath it. Unknown fields are rejected to catch typos at load time.
     """
+    class Config:
+        allow_mutation = False
+        extra = "forbid"
+        arbitrary_types_allowed = True
+
     source_db_path: str
     target_db_path: str
-    # Optional custom transformations for specific columns
-    column_transformations: Dict[str, Union[Callable, str]] = {}
+    # Optional custom transformations for specific columns.
+    # A plain callable is invoked per value. Callables flagged with
+    # `fn._batch = True` are invoked once per insert batch with
+    # (source_connection, records) and must return one value per record.
+    column_transformations: Dict[str, Union[Transform, Callable, str]] = {}
+    # Optional replacement SELECT statements for specific source tables.
+    # When present, the migrator fetches rows with the override instead of
+    # SELECT *, so joined columns (e.g. hh.village) arrive pre-populated
+    # and no per-row Python callback is needed.
+    source_query_overrides: Dict[str, str] = {}
+    # Optional lookup tables to load into memory once at migrator startup,
+    # mapping table -> (key_column, value_column). Small reference tables
+    # (e.g. household) become a single SELECT plus dict lookups instead of
+    # one query per migrated row.
+    preloaded_tables: Dict[str, Tuple[str, str]] = {}
+    # When test_mode is enabled, at most max_rows_per_table rows are migrated
+    # per table. The limit is pushed into the source SELECT as a LIMIT clause
+    # so SQLite never materializes the truncated tail.
+    test_mode: bool = False
+    max_rows_per_table: Optional[int] = None
+
+    @validator("column_transformations")
+    def _wrap_transforms(cls, value):
+        """Normalize callables and string shortcuts into Transform entries."""
+        wrapped = {}
+        for col, fn in value.items():
+            if isinstance(fn, Transform):
+                wrapped[col] = fn
+            elif isinstance(fn, str):
+                if fn not in _NAMED_TRANSFORMS:
+                    raise ValueError(
+                        f"Unknown transformation '{fn}' for column '{col}'; "
+                        f"expected one of: {', '.join(sorted(_NAMED_TRANSFORMS))}")
+                wrapped[col] = Transform(_NAMED_TRANSFORMS[fn])
+            else:
+                wrapped[col] = Transform(fn, batch=bool(getattr(fn, "_batch", False)))
+        return wrapped
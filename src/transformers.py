@@ -1,22 +1,157 @@
-from typing import Any
-from datetime import datetime
-
-def extract_date(datetime_str: str) -> str:
-    """Extract date from datetime string."""
-    try:
-        dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        return datetime_str
-
-def capitalize_string(value: str) -> str:
-    """Capitalize the first letter of each word in a string."""
-    if not isinstance(value, str):
-        return value
-    return value.title()
-
-def combine_fields(field1: Any, field2: Any) -> str:
-    """Combine two fields with a space between them."""
-    return f"{field1} {field2}".strip()
-
+from typing import Any, Optional
+from datetime import datetime
+import re
+
+# Precompiled character filters for cleaning numeric strings; a single
+# C-level substitution replaces a per-character Python loop.
+_INT_STRIP = re.compile(r'[^0-9\-]').sub
+_FLOAT_STRIP = re.compile(r'[^0-9.\-]').sub
+
+# Accepted spellings for boolean values
+_BOOL_MAP = {'true': True, '1': True, 'yes': True, 'on': True,
+             'false': False, '0': False, 'no': False, 'off': False}
+
+# Try to import pandas for vectorized column coercion, but don't fail if
+# it's not available
+PANDAS_AVAILABLE = False
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    pass
+
+def extract_date(datetime_str: str) -> str:
+    """Extract date from datetime string."""
+    try:
+        dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
+        return dt.strftime("%Y-%m-%d")
+    except ValueError:
+        return datetime_str
+
+def capitalize_string(value: str) -> str:
+    """Capitalize the first letter of each word in a string."""
+    if not isinstance(value, str):
+        return value
+    return value.title()
+
+def _int_from_str(value: str) -> Optional[int]:
+    if value.isdigit():
+        return int(value)
+    cleaned = _INT_STRIP('', value)
+    try:
+        return int(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+def _float_from_str(value: str) -> Optional[float]:
+    cleaned = _FLOAT_STRIP('', value)
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+def _bool_from_str(value: str) -> Optional[bool]:
+    return _BOOL_MAP.get(value.lower().strip())
+
+def _none(value: Any) -> None:
+    return None
+
+# Per-type converter tables: one dict lookup on type(value) replaces the
+# isinstance cascade, with the dominant str case (SQLite TEXT affinity)
+# listed first.
+_INT_DISPATCH = {str: _int_from_str, int: int, float: int, bool: int, type(None): _none}
+_FLOAT_DISPATCH = {str: _float_from_str, int: float, float: float, bool: float, type(None): _none}
+_BOOL_DISPATCH = {str: _bool_from_str, bool: bool, int: bool, float: bool, type(None): _none}
+
+def coerce_to_int(value: Any) -> Optional[int]:
+    """Coerce a value to an integer, stripping non-numeric characters."""
+    if type(value) is int:
+        return value
+    fn = _INT_DISPATCH.get(type(value))
+    return fn(value) if fn is not None else None
+
+def coerce_to_float(value: Any) -> Optional[float]:
+    """Coerce a value to a float, stripping non-numeric characters."""
+    if type(value) is float:
+        return value
+    fn = _FLOAT_DISPATCH.get(type(value))
+    return fn(value) if fn is not None else None
+
+def coerce_to_bool(value: Any) -> Optional[bool]:
+    """Coerce a value to a boolean via a single hashed dict lookup."""
+    if type(value) is bool:
+        return value
+    fn = _BOOL_DISPATCH.get(type(value))
+    return fn(value) if fn is not None else None
+
+def _coerce_column(values, vector_fn, scalar_fn) -> list:
+    """Coerce a column with vector_fn over its string elements and
+    scalar_fn over everything else, preserving order.
+
+    The vectorized cleanup is only equivalent to the scalar coercers for
+    actual strings - pushing other types through astype(str) round-trips
+    them via repr (3.5 becomes "3.5" and loses its dot to the digit
+    filter; True becomes "True", which _BOOL_MAP doesn't spell) - so
+    non-string elements always take the scalar path. The dominant
+    all-string case (SQLite TEXT affinity) stays fully vectorized.
+    """
+    series = pd.Series(values, dtype=object)
+    str_mask = series.map(type) == str
+    if str_mask.all():
+        return vector_fn(series)
+    out = [scalar_fn(v) for v in values]
+    if str_mask.any():
+        for i, v in zip(series.index[str_mask], vector_fn(series[str_mask])):
+            out[i] = v
+    return out
+
+def _vector_int(strings) -> list:
+    cleaned = strings.str.replace(r'[^0-9\-]', '', regex=True)
+    numeric = pd.to_numeric(cleaned, errors='coerce')
+    return [None if pd.isna(v) else int(v) for v in numeric]
+
+def _vector_float(strings) -> list:
+    cleaned = strings.str.replace(r'[^0-9.\-]', '', regex=True)
+    numeric = pd.to_numeric(cleaned, errors='coerce')
+    return [None if pd.isna(v) else float(v) for v in numeric]
+
+def _vector_bool(strings) -> list:
+    mapped = strings.str.lower().str.strip().map(_BOOL_MAP)
+    return [None if pd.isna(v) else bool(v) for v in mapped]
+
+def coerce_column_to_int(values) -> list:
+    """Coerce a whole column of values to integers in one pass.
+
+    Uses pandas' vectorized cleaning for string elements when available,
+    falling back to the scalar coercer per value.
+    """
+    if PANDAS_AVAILABLE:
+        return _coerce_column(values, _vector_int, coerce_to_int)
+    return [coerce_to_int(v) for v in values]
+
+def coerce_column_to_float(values) -> list:
+    """Coerce a whole column of values to floats in one pass.
+
+    Uses pandas' vectorized cleaning for string elements when available,
+    falling back to the scalar coercer per value.
+    """
+    if PANDAS_AVAILABLE:
+        return _coerce_column(values, _vector_float, coerce_to_float)
+    return [coerce_to_float(v) for v in values]
+
+def coerce_column_to_bool(values) -> list:
+    """Coerce a whole column of values to booleans in one pass.
+
+    Uses pandas' vectorized string normalization and a single dict map
+    for string elements when available, falling back to a per-value
+    lookup.
+    """
+    if PANDAS_AVAILABLE:
+        return _coerce_column(values, _vector_bool, coerce_to_bool)
+    return [coerce_to_bool(v) for v in values]
+
+def combine_fields(field1: Any, field2: Any) -> str:
+    """Combine two fields with a space between them."""
+    return f"{field1} {field2}".strip()
+
 # Add more transformation functions as needed 
\ No newline at end of file